@@ -0,0 +1,11 @@
+import time
+STARTED = time.perf_counter()
+import sys
+from multiprocessing import freeze_support
+
+# Console entry point for the CLI build. The GUI executable is built with --noconsole, which
+# leaves it without stdout/stderr, so headless use needs this one (or ``python -m aiossl``).
+if __name__ == "__main__":
+    freeze_support()
+    from aiossl.cli import main
+    sys.exit(main(started=STARTED))
@@ -0,0 +1,598 @@
+import os
+import sys
+import time
+import customtkinter as ctk
+from tkinter import filedialog, messagebox, Menu, simpledialog
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from aiossl import certs as certcore
+from aiossl.trust import get_system_trust_index
+from aiossl.learned import get_learned_pool, learn_from_chain
+from aiossl.chain import build_chain, default_sources, write_chain
+from aiossl.keys import KeyPool, KEY_TYPES, KEY_TYPE_LABELS, DEFAULT_KEY_TYPE
+from aiossl.csr import build_csr, write_key_and_csr
+from aiossl.pfx import serialize_pfx, broken_chain_links
+from aiossl.timing import operation, span, record
+from aiossl.tasks import TaskRunner
+
+def resource_path(relative_path):
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, relative_path)
+
+class CSRDialog(ctk.CTkToplevel):
+    def __init__(self, parent, callback, key_pool=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.key_pool = key_pool
+        self.title("Generate CSR and Private Key")
+        self.resizable(True, True)
+        self.transient(parent)
+        self.grab_set()
+        self.geometry("720x700")
+        main_container = ctk.CTkFrame(self)
+        main_container.pack(fill="both", expand=True)
+        self.canvas = ctk.CTkCanvas(main_container)
+        self.scrollbar = ctk.CTkScrollbar(main_container, orientation="vertical", command=self.canvas.yview)
+        self.scrollable_frame = ctk.CTkFrame(self.canvas)
+        self.scrollable_frame.bind("<Configure>", lambda e: self._update_scroll())
+        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.bind("<Configure>", self._update_scrollbar)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        content = ctk.CTkFrame(self.scrollable_frame, corner_radius=12, fg_color="transparent")
+        content.pack(pady=20, padx=25, fill="both", expand=True)
+        ctk.CTkLabel(content, text="CSR Details", font=("Arial", 18, "bold")).pack(pady=(0, 15))
+        fields = [
+            ("Common Name (CN)", "example.com"),
+            ("Country (C)", "US"),
+            ("State/Province (ST)", "California"),
+            ("Locality (L)", "San Francisco"),
+            ("Organization (O)", "My Company"),
+            ("Organizational Unit (OU)", "IT Department"),
+            ("Email Address", "admin@example.com")
+        ]
+        self.entries = {}
+        for label_text, placeholder in fields:
+            row = ctk.CTkFrame(content)
+            row.pack(fill="x", pady=4)
+            ctk.CTkLabel(row, text=label_text + ":", width=160, anchor="w").pack(side="left")
+            entry = ctk.CTkEntry(row, placeholder_text=placeholder, height=36)
+            entry.pack(side="right", fill="x", expand=True, padx=(10, 0))
+            self.entries[label_text.split(" (")[0]] = entry
+        ctk.CTkLabel(content, text="SANs (one per line):", anchor="w").pack(fill="x", pady=(15, 5))
+        self.san_text = ctk.CTkTextbox(content, height=120, wrap="none")
+        self.san_text.pack(fill="both", expand=True, pady=(0, 10))
+        self.placeholder_text = "www.example.com\nmail.example.com\nautodiscover.example.com"
+        self.san_text.insert("1.0", self.placeholder_text)
+        self.san_text.tag_add("placeholder", "1.0", "end")
+        self.san_text.tag_config("placeholder", foreground="#888888")
+        self.placeholder_active = True
+        options_frame = ctk.CTkFrame(content)
+        options_frame.pack(fill="x", pady=10)
+        ctk.CTkLabel(options_frame, text="Key Type:", width=160, anchor="w").pack(side="left", padx=(0, 10))
+        self.key_type_var = ctk.StringVar(value=KEY_TYPE_LABELS[DEFAULT_KEY_TYPE])
+        ctk.CTkComboBox(options_frame, values=[KEY_TYPE_LABELS[t] for t in KEY_TYPES], variable=self.key_type_var,
+                        width=140, state="readonly", command=self.on_key_type_change).pack(side="left")
+        ctk.CTkLabel(options_frame, text=" Passphrase (optional):", anchor="w").pack(side="left", padx=(20, 5))
+        self.private_key_pass_entry = ctk.CTkEntry(options_frame, show="*", placeholder_text="Leave blank = no password", width=200)
+        self.private_key_pass_entry.pack(side="right")
+        btn_frame = ctk.CTkFrame(content, fg_color="transparent")
+        btn_frame.pack(fill="x", pady=20)
+        ctk.CTkButton(btn_frame, text="Generate CSR + Key", command=self.on_generate,
+                      font=("Arial", 12, "bold"), height=40, fg_color="#1e7d1e", hover_color="#1a6b1a").pack(
+            side="left", padx=10, expand=True, fill="x")
+        ctk.CTkButton(btn_frame, text="Cancel", command=self.destroy,
+                      font=("Arial", 12), height=40, fg_color="#7d1e1e", hover_color="#6b1a1a").pack(
+            side="right", padx=10, expand=True, fill="x")
+        self.san_text.bind("<FocusIn>", self.on_san_focus_in)
+        self.san_text.bind("<FocusOut>", self.on_san_focus_out)
+        self.on_key_type_change(self.key_type_var.get())
+    def on_key_type_change(self, value):
+        if self.key_pool:
+            try:
+                self.key_pool.prefill(value)
+            except ValueError:
+                pass
+    def _update_scroll(self):
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self._update_scrollbar()
+    def _update_scrollbar(self, event=None):
+        canvas_height = self.canvas.winfo_height()
+        scrollregion = self.canvas.cget("scrollregion")
+        if scrollregion:
+            coords = scrollregion.split()
+            if len(coords) == 4:
+                content_height = int(coords[3])
+                needs_scroll = content_height > canvas_height
+                if needs_scroll and not self.scrollbar.winfo_ismapped():
+                    self.scrollbar.pack(side="right", fill="y")
+                elif not needs_scroll and self.scrollbar.winfo_ismapped():
+                    self.scrollbar.pack_forget()
+    def on_san_focus_in(self, event):
+        if self.placeholder_active:
+            self.san_text.delete("1.0", "end")
+            self.san_text.tag_remove("placeholder", "1.0", "end")
+            self.placeholder_active = False
+    def on_san_focus_out(self, event):
+        if not self.san_text.get("1.0", "end-1c").strip():
+            self.san_text.insert("1.0", self.placeholder_text)
+            self.san_text.tag_add("placeholder", "1.0", "end")
+            self.placeholder_active = True
+    def on_generate(self):
+        data = {k: e.get().strip() for k, e in self.entries.items()}
+        raw_san = self.san_text.get("1.0", "end-1c").strip()
+        sans = [line.strip() for line in raw_san.splitlines() if line.strip() and not self.placeholder_active]
+        key_type = next((t for t, label in KEY_TYPE_LABELS.items() if label == self.key_type_var.get()), None)
+        if key_type is None:
+            messagebox.showerror("Error", "Invalid key type")
+            return
+        password = self.private_key_pass_entry.get().strip()
+        self.callback(data, sans, key_type, password)
+        self.destroy()
+
+class ExtractPFXDialog(ctk.CTkToplevel):
+    def __init__(self, parent, callback):
+        super().__init__(parent)
+        self.callback = callback
+        self.title("Extract Private Key from PFX/P12")
+        self.resizable(True, True)
+        self.transient(parent)
+        self.grab_set()
+        self.geometry("440x215")
+        main_container = ctk.CTkFrame(self)
+        main_container.pack(fill="both", expand=True)
+        self.canvas = ctk.CTkCanvas(main_container)
+        self.scrollbar = ctk.CTkScrollbar(main_container, orientation="vertical", command=self.canvas.yview)
+        self.scrollable_frame = ctk.CTkFrame(self.canvas)
+        self.scrollable_frame.bind("<Configure>", lambda e: self._update_scroll())
+        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.bind("<Configure>", self._update_scrollbar)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        content = ctk.CTkFrame(self.scrollable_frame, corner_radius=12, fg_color="transparent")
+        content.pack(pady=0, padx=0, fill="both", expand=True)
+        ctk.CTkLabel(content, text="Extract Private Key", font=("Arial", 18, "bold")).pack(pady=(0, 15))
+        file_row = ctk.CTkFrame(content)
+        file_row.pack(fill="x", pady=4)
+        ctk.CTkLabel(file_row, text="PFX/P12 File:", width=160, anchor="w").pack(side="left")
+        self.pfx_entry = ctk.CTkEntry(file_row, placeholder_text="Select file...", height=36)
+        self.pfx_entry.pack(side="left", fill="x", expand=True, padx=(10, 10))
+        browse_btn = ctk.CTkButton(file_row, text="Browse", command=self.browse_pfx, width=100)
+        browse_btn.pack(side="right")
+        pass_row = ctk.CTkFrame(content)
+        pass_row.pack(fill="x", pady=4)
+        ctk.CTkLabel(pass_row, text="Passphrase:", width=160, anchor="w").pack(side="left")
+        self.pass_entry = ctk.CTkEntry(pass_row, show="*", placeholder_text="Enter passphrase...", height=36)
+        self.pass_entry.pack(side="right", fill="x", expand=True, padx=(10, 0))
+        btn_frame = ctk.CTkFrame(content, fg_color="transparent")
+        btn_frame.pack(fill="x", pady=20)
+        ctk.CTkButton(btn_frame, text="Extract Key", command=self.on_extract,
+                      font=("Arial", 12, "bold"), height=40, fg_color="#1e7d1e", hover_color="#1a6b1a").pack(
+            side="left", padx=10, expand=True, fill="x")
+        ctk.CTkButton(btn_frame, text="Cancel", command=self.destroy,
+                      font=("Arial", 12), height=40, fg_color="#7d1e1e", hover_color="#6b1a1a").pack(
+            side="right", padx=10, expand=True, fill="x")
+    def _update_scroll(self):
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self._update_scrollbar()
+    def _update_scrollbar(self, event=None):
+        canvas_height = self.canvas.winfo_height()
+        scrollregion = self.canvas.cget("scrollregion")
+        if scrollregion:
+            coords = scrollregion.split()
+            if len(coords) == 4:
+                content_height = int(coords[3])
+                needs_scroll = content_height > canvas_height
+                if needs_scroll and not self.scrollbar.winfo_ismapped():
+                    self.scrollbar.pack(side="right", fill="y")
+                elif not needs_scroll and self.scrollbar.winfo_ismapped():
+                    self.scrollbar.pack_forget()
+    def browse_pfx(self):
+        path = filedialog.askopenfilename(filetypes=[("PFX files", "*.pfx *.p12")])
+        if path:
+            self.pfx_entry.delete(0, "end")
+            self.pfx_entry.insert(0, path)
+    def on_extract(self):
+        pfx_path = self.pfx_entry.get().strip()
+        pass_phrase = self.pass_entry.get()
+        if not pfx_path:
+            messagebox.showerror("Error", "Please select a PFX/P12 file")
+            return
+        self.callback(pfx_path, pass_phrase)
+        self.destroy()
+
+class AIOSSLToolApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("CMDLAB AIO SSL Tool")
+        self.root.geometry("540x660")
+        self.root.resizable(True, True)
+        ctk.set_appearance_mode("dark")
+        ctk.set_default_color_theme("dark-blue")
+        try:
+            self.root.iconbitmap(resource_path("icon-ico.ico"))
+        except:
+            pass
+        self.cert_file = None
+        self.save_directory = None
+        self.private_key_file = None
+        self.trust_index = None
+        self.learned = None
+        self.key_pool = KeyPool()
+        if self.root.tk.call("info", "exists", "tcl_platform(threaded)"):
+            self.tasks = TaskRunner(self._notify_tasks, on_change=self._update_activity)
+            self.root.bind("<<TaskEvent>>", lambda e: self.tasks.dispatch())
+        else:
+            # Without a threaded Tcl, worker threads must not call into Tk at all; poll the queue instead.
+            self.tasks = TaskRunner(lambda: None, on_change=self._update_activity)
+            self._poll_tasks()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.create_menu()
+        self.create_widgets()
+        self.start_trust_store_load()
+    def _notify_tasks(self):
+        self.root.event_generate("<<TaskEvent>>", when="tail")
+    def _poll_tasks(self):
+        self.tasks.dispatch()
+        self.root.after(50, self._poll_tasks)
+    def _update_activity(self, task=None):
+        active = list(self.tasks.active)
+        self.cancel_button.configure(state="normal" if active else "disabled")
+        if len(active) == 1 and active[0].total:
+            self.progress.stop()
+            self.progress.configure(mode="determinate")
+            self.progress.set(active[0].done / active[0].total)
+        elif active:
+            self.progress.configure(mode="indeterminate")
+            self.progress.start()
+        else:
+            self.progress.stop()
+            self.progress.configure(mode="determinate")
+            self.progress.set(0)
+        if task is not None and task.total:
+            self.chain_status_label.configure(text=f"{task.name}: {task.done}/{task.total}" + (f" - {task.message}" if task.message else ""))
+    def cancel_tasks(self):
+        self.tasks.cancel_all()
+        self.chain_status_label.configure(text="Cancelling...")
+    def _task_cancelled(self, task):
+        self.chain_status_label.configure(text=f"{task.name} cancelled")
+    def on_close(self):
+        self.tasks.shutdown()
+        if self.learned is not None:
+            self.learned.flush()
+        self.key_pool.close()
+        self.root.destroy()
+    def start_trust_store_load(self):
+        self.fullchain_button.configure(text="3. Create Full Chain (loading trust store...)")
+        self.tasks.submit("Loading trust store", self._load_trust_store_task, on_done=self._trust_store_loaded,
+                          on_error=lambda e: messagebox.showerror("Error", f"Could not load the trust store: {e}"))
+    def _load_trust_store_task(self, task):
+        with operation("store.load") as timings:
+            index = self.load_windows_trusted_roots()
+            learned = get_learned_pool()
+        return index, learned, timings
+    def _trust_store_loaded(self, result):
+        self.trust_index, self.learned, timings = result
+        self.fullchain_button.configure(text="3. Create Full Chain")
+        if self.chain_status_label.cget("text").startswith("Ready"):
+            self.chain_status_label.configure(text=f"Trust store ready: {len(self.trust_index)} certificates, {len(self.learned)} learned intermediates ({timings.elapsed * 1000:.0f} ms)")
+        if self.cert_file:
+            self.fullchain_button.configure(state="normal")
+    def create_menu(self):
+        menu = Menu(self.root)
+        self.root.config(menu=menu)
+        file_menu = Menu(menu, tearoff=0)
+        file_menu.add_command(label="Generate CSR and Private Key", command=self.open_csr_dialog)
+        file_menu.add_command(label="Bulk Generate CSRs from Manifest...", command=self.open_csr_batch)
+        file_menu.add_command(label="Extract Private Key from PFX/P12", command=self.open_extract_dialog)
+        file_menu.add_command(label="Bulk Extract PFX/P12 Folder...", command=self.open_pfx_batch)
+        file_menu.add_command(label="Scan Certificate Inventory...", command=self.open_inventory_scan)
+        menu.add_cascade(label="File", menu=file_menu)
+        about_menu = Menu(menu, tearoff=0)
+        about_menu.add_command(label="Version: v6.0", state="disabled")
+        menu.add_cascade(label="About", menu=about_menu)
+    def open_csr_dialog(self):
+        if not self.save_directory:
+            messagebox.showwarning("Warning", "Please select save location first")
+            return
+        CSRDialog(self.root, self.generate_csr_from_data, self.key_pool)
+    def open_csr_batch(self):
+        if not self.save_directory:
+            messagebox.showwarning("Warning", "Please select save location first")
+            return
+        manifest = filedialog.askopenfilename(title="Select CSR Manifest", filetypes=[("CSR manifests", "*.csv *.json"), ("All files", "*.*")])
+        if not manifest:
+            return
+        from aiossl.batch import read_csr_manifest
+        try:
+            entries = read_csr_manifest(manifest)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read manifest: {e}")
+            return
+        self.chain_status_label.configure(text=f"Generating {len(entries)} CSRs...")
+        self.tasks.submit("Bulk CSRs", self._csr_batch_task, entries, on_done=self._csr_batch_done,
+                          on_progress=self._update_activity, on_cancel=self._task_cancelled,
+                          on_error=lambda e: messagebox.showerror("Error", f"Bulk CSR generation failed: {e}"))
+    def _csr_batch_task(self, task, entries):
+        from aiossl.batch import run_csr_batch
+        counts = {"ok": 0, "error": 0}
+        for result in run_csr_batch(entries, self.save_directory):
+            counts[result["status"]] += 1
+            task.progress(counts["ok"] + counts["error"], len(entries), result["name"])
+        return counts
+    def _csr_batch_done(self, counts):
+        self.chain_status_label.configure(text=f"Bulk CSRs: {counts['ok']} generated, {counts['error']} failed")
+        messagebox.showinfo("Bulk CSR Generation", f"{counts['ok']} CSRs generated, {counts['error']} failed.\nSee csr_report.csv in the save location.")
+    def open_pfx_batch(self):
+        if not self.save_directory:
+            messagebox.showwarning("Warning", "Please select save location first")
+            return
+        pfx_dir = filedialog.askdirectory(title="Select Folder of PFX/P12 Files")
+        if not pfx_dir:
+            return
+        password_file = filedialog.askopenfilename(title="Select Password List (one per line)", filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        from aiossl.batch import read_password_list
+        try:
+            passwords = read_password_list(password_file) if password_file else []
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read password list: {e}")
+            return
+        if not passwords:
+            password = simpledialog.askstring("PFX Passphrase", "Passphrase to try for every file:", show="*", parent=self.root)
+            passwords = [password] if password else []
+        output_dir = os.path.join(self.save_directory, "PFX-Extract")
+        self.chain_status_label.configure(text="Extracting PFX/P12 files...")
+        self.tasks.submit("Bulk PFX", self._pfx_batch_task, pfx_dir, passwords, output_dir, on_done=self._pfx_batch_done,
+                          on_progress=self._update_activity, on_cancel=self._task_cancelled,
+                          on_error=lambda e: messagebox.showerror("Error", f"Bulk PFX extraction failed: {e}"))
+    def _pfx_batch_task(self, task, pfx_dir, passwords, output_dir):
+        from aiossl.batch import PFX_EXTENSIONS, iter_input_paths, run_pfx_batch
+        paths = list(iter_input_paths([pfx_dir], extensions=PFX_EXTENSIONS))
+        counts = {"ok": 0, "error": 0}
+        for result in run_pfx_batch(paths, passwords, output_dir):
+            counts[result["status"]] += 1
+            task.progress(counts["ok"] + counts["error"], len(paths), result["name"])
+        return counts, output_dir
+    def _pfx_batch_done(self, result):
+        counts, output_dir = result
+        self.chain_status_label.configure(text=f"Bulk PFX: {counts['ok']} extracted, {counts['error']} failed")
+        messagebox.showinfo("Bulk PFX Extraction", f"{counts['ok']} files extracted, {counts['error']} failed.\nSee pfx_report.csv in {output_dir}.")
+    def open_inventory_scan(self):
+        scan_dir = filedialog.askdirectory(title="Select Folder to Inventory")
+        if not scan_dir:
+            return
+        self.chain_status_label.configure(text="Scanning certificate inventory...")
+        self.tasks.submit("Inventory scan", self._inventory_task, scan_dir, self.save_directory, on_done=self._inventory_done,
+                          on_progress=self._update_activity, on_cancel=self._task_cancelled,
+                          on_error=lambda e: messagebox.showerror("Error", f"Inventory scan failed: {e}"))
+    def _inventory_task(self, task, scan_dir, save_directory):
+        from aiossl.inventory import Inventory, CERT_COLUMNS
+        counts = {}
+        with Inventory() as inventory:
+            for result in inventory.scan([scan_dir], counts=counts):
+                task.progress(sum(counts.values()), None, result["path"])
+            summary = inventory.summary()
+            report = None
+            if save_directory:
+                rows = {(r["path"], r["position"]): r for r in inventory.query(expiring_days=summary["expiring_days"])}
+                rows.update(((r["path"], r["position"]), r) for r in inventory.query(expired=True))
+                rows.update(((r["path"], r["position"]), r) for r in inventory.query(incomplete=True))
+                report = os.path.join(save_directory, "inventory_report.csv")
+                import csv
+                with open(report, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.DictWriter(f, fieldnames=CERT_COLUMNS)
+                    writer.writeheader()
+                    writer.writerows(sorted(rows.values(), key=lambda r: r["not_after"]))
+        return counts, summary, report
+    def _inventory_done(self, result):
+        counts, summary, report = result
+        self.chain_status_label.configure(text=f"Inventory: {summary['certificates']} certificates in {summary['files']} files")
+        message = (f"Scanned: {counts['added']} new, {counts['updated']} changed, {counts['unchanged']} unchanged, "
+                   f"{counts['removed']} removed, {counts['error']} unreadable.\n\n"
+                   f"Expired: {summary['expired']}\nExpiring within {summary['expiring_days']} days: {summary['expiring']}\n"
+                   f"Incomplete chains: {summary['incomplete']}\nUntrusted chains: {summary['untrusted']}")
+        if report:
+            message += f"\n\nCertificates needing attention were written to {report}."
+        messagebox.showinfo("Certificate Inventory", message)
+    def open_extract_dialog(self):
+        if not self.save_directory:
+            messagebox.showwarning("Warning", "Please select save location first")
+            return
+        ExtractPFXDialog(self.root, self.extract_private_key_callback)
+    def generate_csr_from_data(self, data, sans, key_type, password=""):
+        self.chain_status_label.configure(text=f"Generating {KEY_TYPE_LABELS[key_type]} key and CSR...")
+        self.tasks.submit("CSR generation", self._generate_csr_task, data, sans, key_type, password,
+                          on_done=self._csr_generated, on_cancel=self._task_cancelled,
+                          on_error=lambda e: messagebox.showerror("Error", f"CSR generation failed: {e}"))
+    def _generate_csr_task(self, task, data, sans, key_type, password):
+        with operation("csr.generate", key_type=key_type) as timings:
+            key = self.key_pool.take(key_type)
+            task.check_cancelled()
+            csr = build_csr(key, data, sans)
+            priv_path, _ = write_key_and_csr(key, csr, self.save_directory, password)
+        return priv_path, password, timings
+    def _csr_generated(self, result):
+        priv_path, password, timings = result
+        self.private_key_file = priv_path
+        self.private_key_password_entry.delete(0, "end")
+        self.private_key_password_entry.insert(0, password)
+        self.private_key_button.configure(text="4. Private Key - Generated")
+        self.chain_status_label.configure(text=f"CSR + Key generated in {timings.elapsed * 1000:.0f} ms ({timings.summary(3)})")
+        if os.path.exists(os.path.join(self.save_directory, "FullChain.cer")):
+            self.create_pfx_button.configure(state="normal")
+    def extract_private_key_callback(self, pfx_path, pass_phrase):
+        self.chain_status_label.configure(text="Decrypting PFX/P12...")
+        self.tasks.submit("PFX extraction", self._extract_private_key_task, pfx_path, pass_phrase,
+                          on_done=self._save_extracted_key, on_cancel=self._task_cancelled,
+                          on_error=lambda e: messagebox.showerror("Error", f"Failed to extract private key: {str(e)}"))
+    def _extract_private_key_task(self, task, pfx_path, pass_phrase):
+        from cryptography.hazmat.primitives.serialization import pkcs12
+        with open(pfx_path, 'rb') as f:
+            pfx_data = f.read()
+        with span("pkcs12.decode"):
+            private_key, _, extra = pkcs12.load_key_and_certificates(pfx_data, pass_phrase.encode(), default_backend())
+        if private_key is None:
+            raise ValueError("No private key found.")
+        get_learned_pool().learn(extra)
+        return private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        )
+    def _save_extracted_key(self, pem_key):
+        self.chain_status_label.configure(text="Private key decrypted")
+        try:
+            save_path = filedialog.asksaveasfilename(initialdir=self.save_directory, title="Save Private Key", defaultextension=".pem", filetypes=[("PEM files", "*.pem")])
+            if save_path:
+                with open(save_path, 'wb') as f:
+                    f.write(pem_key)
+                messagebox.showinfo("Success", "Private key extracted successfully.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to extract private key: {str(e)}")
+    def create_widgets(self):
+        frame = ctk.CTkFrame(self.root, corner_radius=10)
+        frame.pack(pady=10, padx=10, fill="both", expand=True)
+        ctk.CTkLabel(frame, text="CMDLAB AIO SSL Tool", font=("Arial", 18, "bold")).pack(pady=(10, 20))
+        ctk.CTkLabel(frame, text="Build full chains and PFX from any certificate", font=("Arial", 10)).pack(pady=(0, 15))
+        self.save_dir_button = ctk.CTkButton(frame, text="1. Select Save Location", command=self.select_save_directory)
+        self.save_dir_button.pack(fill="x", pady=8, padx=20)
+        self.browse_button = ctk.CTkButton(frame, text="2. Browse Certificate", command=self.browse_cert, state="disabled")
+        self.browse_button.pack(fill="x", pady=8, padx=20)
+        self.fullchain_button = ctk.CTkButton(frame, text="3. Create Full Chain", command=self.create_full_chain, state="disabled")
+        self.fullchain_button.pack(fill="x", pady=12, padx=20)
+        self.private_key_button = ctk.CTkButton(frame, text="4. Browse Private Key", command=self.browse_private_key, state="disabled")
+        self.private_key_button.pack(fill="x", pady=8, padx=20)
+        kframe = ctk.CTkFrame(frame, fg_color="transparent")
+        kframe.pack(fill="x", pady=5, padx=20)
+        ctk.CTkLabel(kframe, text="Key Passphrase:").pack(side="left", padx=5)
+        self.private_key_password_entry = ctk.CTkEntry(kframe, show="*", width=200)
+        self.private_key_password_entry.pack(side="left", fill="x", expand=True)
+        pframe = ctk.CTkFrame(frame, fg_color="transparent")
+        pframe.pack(fill="x", pady=5, padx=20)
+        ctk.CTkLabel(pframe, text="PFX Passphrase:").pack(side="left", padx=5)
+        self.pfx_password_entry = ctk.CTkEntry(pframe, show="*", width=200)
+        self.pfx_password_entry.pack(side="left", fill="x", expand=True)
+        self.create_pfx_button = ctk.CTkButton(frame, text="5. Create PFX", command=self.create_pfx, state="disabled")
+        self.create_pfx_button.pack(fill="x", pady=12, padx=20)
+        self.chain_status_label = ctk.CTkLabel(frame, text="Ready", font=("Arial", 10, "italic"))
+        self.chain_status_label.pack(pady=10)
+        self.progress = ctk.CTkProgressBar(frame, mode="determinate")
+        self.progress.set(0)
+        self.progress.pack(fill="x", pady=5, padx=20)
+        self.cancel_button = ctk.CTkButton(frame, text="Cancel", command=self.cancel_tasks, state="disabled",
+                                           fg_color="#7d1e1e", hover_color="#6b1a1a", height=28)
+        self.cancel_button.pack(pady=5, padx=20)
+    def select_save_directory(self):
+        self.save_directory = filedialog.askdirectory()
+        if self.save_directory:
+            self.chain_status_label.configure(text="Save location set")
+            self.browse_button.configure(state="normal")
+    def browse_cert(self):
+        self.cert_file = filedialog.askopenfilename(filetypes=[("Certificates", "*.cer *.crt *.pem *.der *.p7b *.p7c *.pfx *.p12"), ("All files", "*.*")])
+        if self.cert_file:
+            self.fullchain_button.configure(state="normal" if self.trust_index is not None else "disabled")
+            self.private_key_button.configure(state="normal")
+            self.chain_status_label.configure(text="Certificate loaded")
+    def create_full_chain(self):
+        if not all([self.cert_file, self.save_directory]) or self.trust_index is None:
+            return
+        from aiossl.batch import PFX_EXTENSIONS
+        password = None
+        if self.cert_file.lower().endswith(PFX_EXTENSIONS):
+            passphrase = simpledialog.askstring("PFX Passphrase", "Passphrase for the PFX file (blank if none):", show="*", parent=self.root)
+            if passphrase is None:
+                return
+            password = passphrase.encode() or None
+        self.fullchain_button.configure(state="disabled")
+        self.chain_status_label.configure(text="Building chain...")
+        self.tasks.submit("Chain build", self._build_chain_task, self.cert_file, self.save_directory, password,
+                          on_done=self._chain_built, on_error=self._chain_failed, on_cancel=self._chain_cancelled)
+    def _build_chain_task(self, task, cert_file, save_directory, password=None):
+        from aiossl.aia import get_default_fetcher
+        with operation("chain.build", path=cert_file) as timings:
+            errors = []
+            certs = certcore.load_certificates_from_file(cert_file, errors, password=password)
+            if not certs and errors:
+                raise ValueError("No valid certificate found:\n" + certcore.describe_bad_blocks(errors))
+            task.check_cancelled()
+            sources, fallbacks = default_sources(self.trust_index, get_default_fetcher(), self.learned)
+            result = build_chain(certs, sources, fallbacks, anchors=self.trust_index)
+            learn_from_chain(self.learned, certs, result)
+            task.check_cancelled()
+            path = write_chain(result.chain, os.path.join(save_directory, "FullChain.cer"))
+        note = "" if result.trusted else " (incomplete)" if not result.complete else " (untrusted root)"
+        note += f" in {timings.elapsed * 1000:.0f} ms ({timings.summary(3)})"
+        return path, note
+    def _chain_built(self, result):
+        path, note = result
+        self.fullchain_button.configure(state="normal")
+        self.chain_status_label.configure(text=f"Full chain saved: {os.path.basename(path)}{note}")
+        self.create_pfx_button.configure(state="normal" if self.private_key_file else "disabled")
+    def _chain_failed(self, error):
+        self.fullchain_button.configure(state="normal")
+        messagebox.showerror("Error", str(error))
+    def _chain_cancelled(self, task):
+        self.fullchain_button.configure(state="normal")
+        self._task_cancelled(task)
+    def browse_private_key(self):
+        f = filedialog.askopenfilename(filetypes=[("PEM Keys", "*.pem *.key"), ("All files", "*.*")])
+        if f:
+            self.private_key_file = f
+            self.private_key_password_entry.delete(0, "end")
+            self.chain_status_label.configure(text="Private key selected")
+            if os.path.exists(os.path.join(self.save_directory, "FullChain.cer")):
+                self.create_pfx_button.configure(state="normal")
+    def create_pfx(self):
+        if not all([self.private_key_file, self.pfx_password_entry.get(), self.save_directory]):
+            messagebox.showwarning("Missing", "Need key, PFX password, and FullChain.cer")
+            return
+        self.create_pfx_button.configure(state="disabled")
+        self.chain_status_label.configure(text="Creating PFX...")
+        self.tasks.submit("PFX creation", self._create_pfx_task, self.private_key_file, self.private_key_password_entry.get(),
+                          self.pfx_password_entry.get(), self.save_directory,
+                          on_done=self._pfx_created, on_error=self._pfx_failed, on_cancel=self._pfx_cancelled)
+    def _create_pfx_task(self, task, key_file, key_password, pfx_password, save_directory):
+        with operation("pfx.create") as timings:
+            pwd = key_password.encode() or None
+            with open(key_file, "rb") as f:
+                key = serialization.load_pem_private_key(f.read(), password=pwd, backend=default_backend())
+            with open(os.path.join(save_directory, "FullChain.cer"), "rb") as f:
+                chain_data = f.read()
+            certs = self.load_certificates_from_pem(chain_data)
+            pfx = serialize_pfx(key, certs, pfx_password.encode())
+            broken = broken_chain_links(certs)
+            task.check_cancelled()
+            path = os.path.join(save_directory, "FullChain-pfx.pfx")
+            with span("write.pfx"), open(path, "wb") as f:
+                f.write(pfx)
+        status = f"PFX created: {os.path.basename(path)} in {timings.elapsed * 1000:.0f} ms"
+        if broken:
+            status += f" (warning: {len(broken)} chain link(s) do not verify)"
+        return status
+    def _pfx_created(self, status):
+        self.create_pfx_button.configure(state="normal")
+        self.chain_status_label.configure(text=status)
+    def _pfx_failed(self, error):
+        self.create_pfx_button.configure(state="normal")
+        messagebox.showerror("Error", f"PFX creation failed: {error}")
+    def _pfx_cancelled(self, task):
+        self.create_pfx_button.configure(state="normal")
+        self._task_cancelled(task)
+    def load_certificates_from_pem(self, data):
+        return certcore.load_certificates_from_pem(data)
+    def is_self_signed(self, cert):
+        return certcore.is_self_signed(cert)
+    def verify_signature(self, child, parent):
+        return certcore.verify_signature(child, parent)
+    def load_windows_trusted_roots(self):
+        return get_system_trust_index()
+
+def run(started=None):
+    """Open the main window; ``started`` is the entry script's ``time.perf_counter()`` at process start."""
+    root = ctk.CTk()
+    app = AIOSSLToolApp(root)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        record("startup.gui", elapsed)
+        app.chain_status_label.configure(text=f"Ready (started in {elapsed * 1000:.0f} ms)")
+    root.mainloop()
\ No newline at end of file
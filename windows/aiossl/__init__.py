@@ -0,0 +1,33 @@
+import importlib
+
+# Names are resolved on first access (PEP 562) so that ``import aiossl`` stays cheap and a
+# headless command only pays for the submodules it actually uses.
+_EXPORTS = {
+    "certs": ("is_self_signed", "verify_signature", "iter_certificates", "iter_certificates_from_file",
+              "load_certificates", "load_certificates_from_pem", "load_certificates_from_file", "BadBlock",
+              "VerifyCache", "verify_cache_stats"),
+    "trust": ("TrustIndex", "get_system_trust_index", "load_system_trust_index", "load_trust_index"),
+    "aia": ("AIAFetcher", "ca_issuers_urls", "get_default_fetcher"),
+    "learned": ("IntermediatePool", "get_learned_pool", "learn_from_chain"),
+    "inventory": ("Inventory",),
+    "chain": ("ChainResult", "RejectedPath", "build_chain", "default_sources", "write_chain"),
+    "keys": ("KeyPool", "generate_private_key", "key_type_name", "signature_hash", "KEY_TYPES"),
+    "csr": ("build_csr", "write_key_and_csr"),
+    "pfx": ("serialize_pfx", "broken_chain_links"),
+    "timing": ("span", "operation", "record", "Timings", "set_perf_log", "set_profiler_hook", "set_profile_dir"),
+    "tasks": ("Task", "TaskRunner"),
+}
+_LOCATIONS = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_LOCATIONS)
+
+def __getattr__(name):
+    module = _LOCATIONS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
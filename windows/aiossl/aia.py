@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from cryptography import x509
+from cryptography.x509.oid import AuthorityInformationAccessOID
+from .certs import load_certificates, verify_signature
+from .paths import cache_path
+from .timing import span
+
+DEFAULT_TIMEOUT = (5, 15)
+DEFAULT_MAX_AGE = 24 * 3600
+MAX_RESPONSE_BYTES = 1024 * 1024
+MAX_MEMORY_ENTRIES = 512
+RETRY_AFTER = 60
+
+def ca_issuers_urls(cert):
+    try:
+        aia = cert.extensions.get_extension_for_class(x509.AuthorityInformationAccess).value
+    except (x509.ExtensionNotFound, ValueError):
+        return []
+    return [d.access_location.value for d in aia
+            if d.access_method == AuthorityInformationAccessOID.CA_ISSUERS
+            and isinstance(d.access_location, x509.UniformResourceIdentifier)
+            and d.access_location.value.lower().startswith(("http://", "https://"))]
+
+def parse_issuer_response(data):
+    """Certificates from a CA Issuers response: DER, PEM, or PKCS#7 in either encoding."""
+    return load_certificates(data)
+
+class AIAFetcher:
+    """Downloads CA Issuers certificates through one pooled session and a revalidating disk cache.
+
+    Bodies are also kept in a bounded in-memory LRU until their ``max-age`` runs out, so a
+    long-running service still revalidates and picks up re-issued CA certificates.
+    """
+    def __init__(self, cache_dir=None, timeout=DEFAULT_TIMEOUT, max_age=DEFAULT_MAX_AGE, max_workers=4, session=None,
+                 max_memory=MAX_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir or cache_path("aia")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.timeout = timeout
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self.session = session or self._make_session(max_workers)
+        self.max_memory = max_memory
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+    @staticmethod
+    def _make_session(pool_size):
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "AIO-SSL-Tool"
+        return session
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, key + ".bin"), os.path.join(self.cache_dir, key + ".json")
+    def _read_cache(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return f.read(), meta
+        except (OSError, ValueError):
+            return None, None
+    def _write_cache(self, url, body, meta):
+        body_path, meta_path = self._paths(url)
+        try:
+            if body is not None:
+                with open(body_path + ".tmp", "wb") as f:
+                    f.write(body)
+                os.replace(body_path + ".tmp", body_path)
+            with open(meta_path + ".tmp", "w") as f:
+                json.dump(meta, f)
+            os.replace(meta_path + ".tmp", meta_path)
+        except OSError:
+            pass
+    def _max_age(self, response):
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+        return int(match.group(1)) if match else self.max_age
+    def _remember(self, url, body, expires):
+        with self._lock:
+            self._memory[url] = (body, expires)
+            self._memory.move_to_end(url)
+            while len(self._memory) > self.max_memory:
+                self._memory.popitem(last=False)
+    def fetch(self, url):
+        """Raw response body for ``url``, from memory, the disk cache, or the network."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None and now < entry[1]:
+                self._memory.move_to_end(url)
+                return entry[0]
+        body, meta = self._read_cache(url)
+        if body is not None:
+            expires = meta.get("fetched_at", 0) + meta.get("max_age", self.max_age)
+            if now < expires:
+                self._remember(url, body, expires)
+                return body
+        from requests import RequestException
+        headers = {}
+        if body is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            with response:
+                if response.status_code == 304 and body is not None:
+                    meta.update(fetched_at=now, max_age=self._max_age(response))
+                    self._write_cache(url, None, meta)
+                    expires = now + meta["max_age"]
+                else:
+                    response.raise_for_status()
+                    fresh = response.raw.read(MAX_RESPONSE_BYTES + 1, decode_content=True)
+                    if len(fresh) > MAX_RESPONSE_BYTES:
+                        raise ValueError(f"Response from {url} is too large")
+                    body = fresh
+                    expires = now + self._max_age(response)
+                    self._write_cache(url, body, {
+                        "url": url,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "fetched_at": now,
+                        "max_age": self._max_age(response),
+                    })
+        except (RequestException, ValueError):
+            if body is None:
+                return None
+            # Serve the stale copy, but give the server another chance soon rather than after a full max-age.
+            expires = now + RETRY_AFTER
+        self._remember(url, body, expires)
+        return body
+    def fetch_many(self, urls):
+        """Map each URL to its body (or None), fetching uncached URLs concurrently."""
+        urls = list(dict.fromkeys(urls))
+        if len(urls) <= 1:
+            return {url: self.fetch(url) for url in urls}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as pool:
+            return dict(zip(urls, pool.map(self.fetch, urls)))
+    @staticmethod
+    def _parse(body):
+        return parse_issuer_response(body) if body else []
+    def certificates(self, url):
+        return self._parse(self.fetch(url))
+    def candidates(self, cert):
+        """Certificates behind ``cert``'s CA Issuers URLs whose subject matches its issuer, unverified."""
+        urls = ca_issuers_urls(cert)
+        with span("lookup.aia", urls=len(urls)):
+            bodies = self.fetch_many(urls)
+        return [c for url in urls for c in self._parse(bodies.get(url)) if c.subject == cert.issuer]
+    def find_issuer(self, cert):
+        """First certificate behind ``cert``'s CA Issuers URLs whose key verifies ``cert``."""
+        for candidate in self.candidates(cert):
+            if verify_signature(cert, candidate):
+                return candidate
+        return None
+    def close(self):
+        self.session.close()
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+def get_default_fetcher():
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = AIAFetcher()
+        return _default_fetcher
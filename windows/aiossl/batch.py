@@ -0,0 +1,313 @@
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from cryptography.hazmat.primitives import serialization
+from .certs import CERT_EXTENSIONS, load_certificates_from_file, verify_cache_stats
+from .chain import build_chain, default_sources, write_chain, chain_output_name
+from .trust import load_trust_index
+from .csr import build_csr, write_key_and_csr
+from .keys import DEFAULT_KEY_TYPE, generate_private_key, key_type_name
+from .timing import operation, span
+
+def iter_input_paths(sources, manifest=None, extensions=CERT_EXTENSIONS):
+    """Yield certificate paths lazily from files, directory trees and an optional manifest."""
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line if os.path.isabs(line) else os.path.join(base, line)
+    for source in sources:
+        if os.path.isdir(source):
+            for dirpath, dirnames, filenames in os.walk(source):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if name.lower().endswith(extensions):
+                        yield os.path.join(dirpath, name)
+        else:
+            yield source
+
+def bounded_map(pool, fn, items, max_pending):
+    """Like ``pool.map`` but keeps at most ``max_pending`` tasks queued and yields in completion order.
+
+    Closing the generator early cancels every task that has not started yet.
+    """
+    pending = set()
+    try:
+        for item in items:
+            pending.add(pool.submit(fn, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+_worker = {}
+
+def chain_context(trust_sources=(), use_system_store=True, use_aia=True, use_learned=True):
+    """Trust anchors, learned pool and issuer sources for building chains in this process."""
+    index = load_trust_index(trust_sources, use_system_store)
+    fetcher = None
+    if use_aia:
+        from .aia import get_default_fetcher
+        fetcher = get_default_fetcher()
+    learned = None
+    if use_learned:
+        from .learned import get_learned_pool
+        learned = get_learned_pool()
+    sources, fallbacks = default_sources(index, fetcher, learned)
+    return {"sources": sources, "fallbacks": fallbacks, "anchors": index, "learned": learned}
+
+def init_chain_worker(trust_sources=(), use_system_store=True, use_aia=True, use_learned=True):
+    _worker.update(chain_context(trust_sources, use_system_store, use_aia, use_learned))
+
+def chain_one(task):
+    path, output_dir = task
+    start = time.perf_counter()
+    result = {"path": path}
+    try:
+        with operation("chain.build", path=path):
+            errors = []
+            certs = load_certificates_from_file(path, errors)
+            if errors:
+                result["bad_blocks"] = [list(e) for e in errors]
+            chain = build_chain(certs, _worker["sources"], _worker["fallbacks"], _worker["anchors"])
+            if _worker["learned"] is not None:
+                from .learned import learn_from_chain
+                learn_from_chain(_worker["learned"], certs, chain)
+            result["output"] = write_chain(chain.chain, os.path.join(output_dir, chain_output_name(path, chain.chain[0])))
+        result.update(status=chain.status, depth=chain.depth, trusted=chain.trusted,
+                      rejected=[{"depth": len(r.chain), "reason": r.reason} for r in chain.rejected])
+    except Exception as e:
+        result.update(status="error", depth=0, error=str(e))
+    result["elapsed"] = round(time.perf_counter() - start, 4)
+    result["_worker"] = dict(verify_cache_stats(), pid=os.getpid())
+    return result
+
+def run_chain_batch(paths, output_dir, workers=None, trust_sources=(), use_system_store=True, use_aia=True,
+                    use_learned=True):
+    """Build chains for ``paths`` across a process pool, yielding one result dict per input."""
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    tasks = ((path, output_dir) for path in paths)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_chain_worker,
+                             initargs=(tuple(trust_sources), use_system_store, use_aia, use_learned)) as pool:
+        yield from bounded_map(pool, chain_one, tasks, workers * 4)
+
+MANIFEST_FIELDS = {
+    "common_name": "Common Name",
+    "country": "Country",
+    "state": "State/Province",
+    "locality": "Locality",
+    "organization": "Organization",
+    "organizational_unit": "Organizational Unit",
+    "email": "Email Address",
+}
+
+def parse_csr_entry(row):
+    """Normalise one manifest row or JSON object into CSR generation parameters.
+
+    ``key_type`` takes any name ``keys.key_type_name`` accepts; an older ``key_size`` column means RSA.
+    """
+    row = {k.strip().lower(): v for k, v in row.items() if k}
+    data = {field: str(row.get(key) or "").strip() for key, field in MANIFEST_FIELDS.items()}
+    sans = row.get("sans") or []
+    if isinstance(sans, str):
+        sans = re.split(r"[\s,;]+", sans)
+    return {
+        "data": data,
+        "sans": [s.strip() for s in sans if s and s.strip()],
+        "key_type": key_type_name(row.get("key_type") or row.get("key_size") or DEFAULT_KEY_TYPE),
+        "passphrase": str(row.get("passphrase") or ""),
+    }
+
+def invalid_csr_entry(row, number, error):
+    """Placeholder for a manifest row that could not be parsed; ``run_csr_batch`` reports it as an error."""
+    row = {str(k).strip().lower(): v for k, v in row.items() if k} if isinstance(row, dict) else {}
+    return {
+        "data": {"Common Name": str(row.get("common_name") or "").strip() or f"row-{number}"},
+        "sans": [],
+        "key_type": str(row.get("key_type") or row.get("key_size") or ""),
+        "passphrase": "",
+        "error": f"Entry {number}: {error}",
+    }
+
+def read_csr_manifest(path):
+    """Entries from a CSV (header row) or JSON (list of objects) CSR manifest.
+
+    A row that does not parse becomes an entry carrying an ``error`` instead of failing the whole manifest.
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+        if isinstance(rows, dict):
+            rows = rows.get("entries", [])
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+    entries = []
+    for number, row in enumerate(rows, 1):
+        try:
+            entries.append(parse_csr_entry(row))
+        except (ValueError, TypeError, AttributeError) as e:
+            entries.append(invalid_csr_entry(row, number, e))
+    return entries
+
+def _safe_name(text):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", text.replace("*", "wildcard")).strip("._") or "csr"
+
+def unique_names(bases):
+    """Filesystem-safe versions of ``bases``, suffixed with -2, -3, ... where they would collide."""
+    used = set()
+    names = []
+    for base in bases:
+        base = _safe_name(base)
+        name, n = base, 2
+        while name.lower() in used:
+            name, n = f"{base}-{n}", n + 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+def assign_csr_names(entries):
+    for entry, name in zip(entries, unique_names(e["data"]["Common Name"] for e in entries)):
+        entry["name"] = name
+    return entries
+
+def _csr_result(entry):
+    return {"name": entry["name"], "common_name": entry["data"]["Common Name"], "key_type": entry["key_type"]}
+
+def csr_one(task):
+    entry, output_dir = task
+    start = time.perf_counter()
+    result = _csr_result(entry)
+    try:
+        with operation("csr.generate", entry=entry["name"]):
+            key = generate_private_key(entry["key_type"])
+            csr = build_csr(key, entry["data"], entry["sans"])
+            key_path, csr_path = write_key_and_csr(key, csr, output_dir, entry["passphrase"],
+                                                   key_name=entry["name"] + ".key.pem", csr_name=entry["name"] + ".csr.pem")
+        result.update(status="ok", key=key_path, csr=csr_path)
+    except Exception as e:
+        result.update(status="error", error=str(e))
+    result["elapsed"] = round(time.perf_counter() - start, 4)
+    return result
+
+def run_csr_batch(entries, output_dir, workers=None, report_name="csr_report.csv"):
+    """Generate keys and CSRs for manifest ``entries`` across a process pool, yielding one result per entry.
+
+    A CSV summary of every entry (never including passphrases) is written to ``report_name`` in ``output_dir``.
+    Entries that failed to parse are reported as errors without being submitted.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    entries = assign_csr_names(entries)
+    workers = workers or os.cpu_count() or 1
+    columns = ["name", "common_name", "key_type", "status", "key", "csr", "error", "elapsed"]
+    with open(os.path.join(output_dir, report_name), "w", newline="", encoding="utf-8") as report:
+        writer = csv.DictWriter(report, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for entry in entries:
+            if "error" in entry:
+                result = dict(_csr_result(entry), status="error", error=entry["error"], elapsed=0.0)
+                writer.writerow(result)
+                report.flush()
+                yield result
+        valid = [e for e in entries if "error" not in e]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in bounded_map(pool, csr_one, ((e, output_dir) for e in valid), workers * 2):
+                writer.writerow(result)
+                report.flush()
+                yield result
+
+PFX_EXTENSIONS = (".pfx", ".p12")
+
+def read_password_list(path):
+    """One candidate password per line; a blank line stands for the empty password."""
+    with open(path, encoding="utf-8") as f:
+        return list(dict.fromkeys(line.rstrip("\r\n") for line in f))
+
+def init_pfx_worker(passwords, use_learned=True):
+    _worker["passwords"] = [None] + [p.encode() for p in passwords]
+    _worker["learned"] = None
+    if use_learned:
+        from .learned import get_learned_pool
+        _worker["learned"] = get_learned_pool()
+
+def pfx_one(task):
+    from cryptography.hazmat.primitives.serialization import pkcs12
+    path, name, output_dir = task
+    start = time.perf_counter()
+    result = {"path": path, "name": name}
+    try:
+        with operation("pfx.extract", path=path):
+            with open(path, "rb") as f:
+                data = f.read()
+            opened = None
+            for index, password in enumerate(_worker["passwords"]):
+                try:
+                    with span("pkcs12.decode"):
+                        opened = pkcs12.load_key_and_certificates(data, password)
+                    result["password_index"] = index
+                    break
+                except ValueError:
+                    continue
+            if opened is None:
+                raise ValueError(f"None of the {len(_worker['passwords'])} candidate passwords opened the file")
+            key, cert, extra = opened
+            if _worker["learned"] is not None:
+                _worker["learned"].learn(extra)
+            outputs = {}
+            with span("write.pfx_parts"):
+                if key is not None:
+                    outputs["key"] = os.path.join(output_dir, name + ".key.pem")
+                    with open(outputs["key"], "wb") as f:
+                        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                                  serialization.NoEncryption()))
+                if cert is not None:
+                    outputs["cert"] = os.path.join(output_dir, name + ".crt.pem")
+                    with open(outputs["cert"], "wb") as f:
+                        f.write(cert.public_bytes(serialization.Encoding.PEM))
+                if extra:
+                    outputs["chain"] = os.path.join(output_dir, name + ".chain.pem")
+                    with open(outputs["chain"], "wb") as f:
+                        for c in extra:
+                            f.write(c.public_bytes(serialization.Encoding.PEM))
+        result.update(outputs, status="ok", chain_certs=len(extra))
+    except Exception as e:
+        result.update(status="error", error=str(e))
+    result["elapsed"] = round(time.perf_counter() - start, 4)
+    return result
+
+def run_pfx_batch(paths, passwords, output_dir, workers=None, report_name="pfx_report.csv", use_learned=True):
+    """Open every PFX/P12 in ``paths`` with the first working candidate password, across a process pool.
+
+    Each file's key, leaf and chain are written to ``<name>.key.pem``, ``.crt.pem`` and ``.chain.pem``.
+    ``password_index`` in the results and the CSV report is 0 for "no password" and otherwise the
+    1-based position in ``passwords``, so the report never contains the passwords themselves.
+    Intermediates found in the files are added to the learned pool unless ``use_learned`` is false.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = list(paths)
+    names = unique_names(os.path.splitext(os.path.basename(p))[0] for p in paths)
+    workers = workers or os.cpu_count() or 1
+    columns = ["path", "name", "status", "password_index", "key", "cert", "chain", "chain_certs", "error", "elapsed"]
+    with open(os.path.join(output_dir, report_name), "w", newline="", encoding="utf-8") as report:
+        writer = csv.DictWriter(report, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_pfx_worker,
+                                 initargs=(list(passwords), use_learned)) as pool:
+            tasks = ((path, name, output_dir) for path, name in zip(paths, names))
+            for result in bounded_map(pool, pfx_one, tasks, workers * 2):
+                writer.writerow(result)
+                report.flush()
+                yield result
@@ -0,0 +1,261 @@
+import binascii
+import datetime
+import mmap
+import threading
+from collections import namedtuple, OrderedDict
+from cryptography import x509
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import dsa, ec, ed448, ed25519, rsa
+from .timing import span
+
+BadBlock = namedtuple("BadBlock", "offset length reason")
+
+CERT_EXTENSIONS = (".pem", ".crt", ".cer", ".der")
+
+PEM_BEGIN = b"-----BEGIN "
+PEM_DASHES = b"-----"
+PEM_CERT_LABELS = (b"CERTIFICATE", b"X509 CERTIFICATE", b"TRUSTED CERTIFICATE", b"PKCS7", b"CMS")
+PKCS7_SIGNED_DATA_OID = bytes.fromhex("06092a864886f70d010702")
+
+def _der_element_length(buf, pos):
+    """Total length of the ASN.1 SEQUENCE starting at ``pos``, or None if there is none."""
+    if len(buf) - pos < 2 or buf[pos] != 0x30:
+        return None
+    first = buf[pos + 1]
+    if first < 0x80:
+        return 2 + first
+    n = first & 0x7F
+    if n == 0 or n > 4 or len(buf) - pos < 2 + n:
+        return None
+    return 2 + n + int.from_bytes(bytes(buf[pos + 2:pos + 2 + n]), "big")
+
+def _der_body_start(buf, pos):
+    first = buf[pos + 1]
+    return pos + 2 + (first & 0x7F if first >= 0x80 else 0)
+
+def _parse_der(der, password=None):
+    """Certificates in one DER element: a certificate, a PKCS#7 bundle, or a PKCS#12 file."""
+    if _der_element_length(der, 0) is None:
+        raise ValueError("Not a DER SEQUENCE")
+    inner = der[_der_body_start(der, 0):]
+    if inner[:1] == b"\x30":
+        return [x509.load_der_x509_certificate(der, default_backend())]
+    if inner.startswith(PKCS7_SIGNED_DATA_OID):
+        from cryptography.hazmat.primitives.serialization import pkcs7
+        return pkcs7.load_der_pkcs7_certificates(der)
+    if inner[:3] == b"\x02\x01\x03":
+        from cryptography.hazmat.primitives.serialization import pkcs12
+        for candidate in ([password] if password is not None else [None, b""]):
+            try:
+                with span("pkcs12.decode"):
+                    _, cert, extra = pkcs12.load_key_and_certificates(der, candidate, default_backend())
+                return ([cert] if cert else []) + list(extra)
+            except ValueError:
+                continue
+        raise ValueError("PKCS#12 data is encrypted; a password is required")
+    raise ValueError("Unrecognised DER structure")
+
+def _scan_der(buf, view, errors, password):
+    pos, size = 0, len(buf)
+    while pos < size:
+        if buf[pos] in b" \t\r\n\x00":
+            pos += 1
+            continue
+        length = _der_element_length(view, pos)
+        if length is None or pos + length > size:
+            if errors is not None:
+                errors.append(BadBlock(pos, size - pos, "Not a DER certificate, PKCS#7 or PKCS#12 structure"))
+            return
+        try:
+            yield from _parse_der(bytes(view[pos:pos + length]), password)
+        except ValueError as e:
+            if errors is not None:
+                errors.append(BadBlock(pos, length, str(e)))
+        pos += length
+
+def _scan_pem(buf, view, errors, password):
+    pos = 0
+    while True:
+        begin = buf.find(PEM_BEGIN, pos)
+        if begin < 0:
+            return
+        label_end = buf.find(PEM_DASHES, begin + len(PEM_BEGIN))
+        if label_end < 0:
+            return
+        label = bytes(view[begin + len(PEM_BEGIN):label_end])
+        footer = b"-----END " + label + PEM_DASHES
+        end = buf.find(footer, label_end)
+        if end < 0:
+            if errors is not None:
+                errors.append(BadBlock(begin, len(buf) - begin, f"Unterminated PEM block '{label.decode(errors='replace')}'"))
+            return
+        pos = end + len(footer)
+        if label not in PEM_CERT_LABELS:
+            continue
+        try:
+            der = binascii.a2b_base64(bytes(view[label_end + len(PEM_DASHES):end]))
+            if label == b"TRUSTED CERTIFICATE":
+                der = der[:_der_element_length(der, 0) or len(der)]
+            yield from _parse_der(der, password)
+        except (ValueError, binascii.Error, IndexError) as e:
+            if errors is not None:
+                errors.append(BadBlock(begin, pos - begin, str(e) or "Invalid PEM block"))
+
+def iter_certificates(data, errors=None, password=None):
+    """Lazily yield certificates from PEM, DER, PKCS#7 or PKCS#12 ``data`` in a single pass.
+
+    ``data`` may be bytes or an mmap; blocks are sliced through a memoryview so only the
+    current certificate is copied. Unparseable blocks are appended to ``errors`` as
+    ``BadBlock(offset, length, reason)`` when a list is given.
+    """
+    view = memoryview(data)
+    try:
+        if data.find(PEM_BEGIN) >= 0:
+            yield from _scan_pem(data, view, errors, password)
+        else:
+            yield from _scan_der(data, view, errors, password)
+    finally:
+        view.release()
+
+def iter_certificates_from_file(path, errors=None, password=None):
+    """Like ``iter_certificates`` over a memory-mapped file, so large bundles stream in constant memory."""
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return
+        with mapped:
+            yield from iter_certificates(mapped, errors, password)
+
+def load_certificates(data, errors=None, password=None):
+    with span("parse.certificates", bytes=len(data)):
+        return list(iter_certificates(data, errors, password))
+
+def load_certificates_from_pem(data):
+    return load_certificates(data)
+
+def load_certificates_from_file(path, errors=None, password=None):
+    with span("parse.file", path=path):
+        return list(iter_certificates_from_file(path, errors, password))
+
+def describe_bad_blocks(errors, limit=5):
+    lines = [f"offset {e.offset}: {e.reason}" for e in errors[:limit]]
+    if len(errors) > limit:
+        lines.append(f"... and {len(errors) - limit} more")
+    return "\n".join(lines)
+
+def is_self_signed(cert):
+    return cert.issuer == cert.subject
+
+def _rsa_padding(cert):
+    params = getattr(cert, "signature_algorithm_parameters", None)
+    if isinstance(params, (padding.PKCS1v15, padding.PSS)):
+        return params
+    if cert.signature_algorithm_oid == x509.SignatureAlgorithmOID.RSASSA_PSS:
+        return padding.PSS(mgf=padding.MGF1(cert.signature_hash_algorithm), salt_length=padding.PSS.AUTO)
+    return padding.PKCS1v15()
+
+def _verify_uncached(child, parent):
+    """Check ``child``'s signature with ``parent``'s key, using the scheme that key type requires."""
+    try:
+        public_key = parent.public_key()
+        signature, tbs = child.signature, child.tbs_certificate_bytes
+        if isinstance(public_key, rsa.RSAPublicKey):
+            public_key.verify(signature, tbs, _rsa_padding(child), child.signature_hash_algorithm)
+        elif isinstance(public_key, ec.EllipticCurvePublicKey):
+            public_key.verify(signature, tbs, ec.ECDSA(child.signature_hash_algorithm))
+        elif isinstance(public_key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)):
+            public_key.verify(signature, tbs)
+        elif isinstance(public_key, dsa.DSAPublicKey):
+            public_key.verify(signature, tbs, child.signature_hash_algorithm)
+        else:
+            return False
+        return True
+    except Exception:
+        return False
+
+class VerifyCache:
+    """Bounded LRU of signature results keyed by (child fingerprint, issuer fingerprint)."""
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+    def verify(self, child, parent):
+        key = (fingerprint(child), fingerprint(parent))
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        with span("verify.signature"):
+            result = _verify_uncached(child, parent)
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._results), "maxsize": self.maxsize}
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+verify_cache = VerifyCache()
+
+def verify_signature(child, parent):
+    return verify_cache.verify(child, parent)
+
+def verify_cache_stats():
+    return verify_cache.stats()
+
+def subject_key_identifier(cert):
+    try:
+        return cert.extensions.get_extension_for_class(x509.SubjectKeyIdentifier).value.digest
+    except (x509.ExtensionNotFound, ValueError):
+        return None
+
+def authority_key_identifier(cert):
+    try:
+        return cert.extensions.get_extension_for_class(x509.AuthorityKeyIdentifier).value.key_identifier
+    except (x509.ExtensionNotFound, ValueError):
+        return None
+
+def subject_alt_names(cert):
+    """DNS names, IP addresses, e-mail addresses and URIs from the SubjectAlternativeName extension."""
+    try:
+        san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    except (x509.ExtensionNotFound, ValueError):
+        return []
+    return [str(name.value) for name in san
+            if isinstance(name, (x509.DNSName, x509.IPAddress, x509.RFC822Name, x509.UniformResourceIdentifier))]
+
+def is_ca_certificate(cert):
+    try:
+        return cert.extensions.get_extension_for_class(x509.BasicConstraints).value.ca
+    except (x509.ExtensionNotFound, ValueError):
+        return False
+
+def fingerprint(cert):
+    return cert.fingerprint(hashes.SHA256())
+
+
+def validity_window(cert):
+    try:
+        return cert.not_valid_before_utc, cert.not_valid_after_utc
+    except AttributeError:
+        return (cert.not_valid_before.replace(tzinfo=datetime.timezone.utc),
+                cert.not_valid_after.replace(tzinfo=datetime.timezone.utc))
+
+def is_valid_at(cert, when=None):
+    when = when or datetime.datetime.now(datetime.timezone.utc)
+    not_before, not_after = validity_window(cert)
+    return not_before <= when <= not_after
@@ -0,0 +1,138 @@
+import datetime
+import heapq
+import itertools
+import os
+from collections import namedtuple
+from cryptography.hazmat.primitives import serialization
+from .certs import is_self_signed, fingerprint, verify_signature, is_valid_at
+from .trust import TrustIndex
+from .timing import span
+
+MAX_CHAIN_DEPTH = 10
+MAX_EXPANSIONS = 256
+
+RejectedPath = namedtuple("RejectedPath", "chain reason")
+
+class ChainResult:
+    def __init__(self, chain, complete, trusted=False, rejected=()):
+        self.chain = chain
+        self.complete = complete
+        self.trusted = trusted
+        self.rejected = list(rejected)
+    @property
+    def depth(self):
+        return len(self.chain)
+    @property
+    def status(self):
+        return "ok" if self.complete else "incomplete"
+
+def default_sources(trust_index=None, fetcher=None, learned=None):
+    """``(sources, fallbacks)`` the way the GUI uses them: learned intermediates and the trust store
+    first, AIA only when they have nothing."""
+    sources = [s for s in (learned, trust_index) if s is not None]
+    fallbacks = [fetcher] if fetcher is not None else []
+    return sources, fallbacks
+
+def pick_leaf(certs):
+    """The first certificate in a bundle that does not issue any other certificate in it."""
+    issuers = {c.issuer.public_bytes() for c in certs if not is_self_signed(c)}
+    for cert in certs:
+        if cert.subject.public_bytes() not in issuers:
+            return cert
+    return certs[0]
+
+class _IssuerGraph:
+    def __init__(self, sources, fallbacks):
+        self.sources = sources
+        self.fallbacks = fallbacks
+        self._edges = {}
+    def issuers(self, cert):
+        """Verified issuers of ``cert``; fallback sources are only asked when the others have none."""
+        fp = fingerprint(cert)
+        if fp not in self._edges:
+            found = {}
+            for group in (self.sources, self.fallbacks):
+                for source in group:
+                    for candidate in source.candidates(cert):
+                        cfp = fingerprint(candidate)
+                        if cfp != fp and cfp not in found and verify_signature(cert, candidate):
+                            found[cfp] = candidate
+                if found:
+                    break
+            self._edges[fp] = list(found.values())
+        return self._edges[fp]
+
+def _path_rank(path, anchors, now):
+    last = path[-1]
+    complete = is_self_signed(last)
+    trusted = complete and anchors is not None and last in anchors
+    invalid = [c for c in path if not is_valid_at(c, now)]
+    return (0 if trusted else 1 if complete else 2, len(invalid), len(path)), trusted, invalid
+
+def _rejection_reason(rank, invalid, best_rank):
+    if invalid:
+        return "outside validity period: " + ", ".join(c.subject.rfc4514_string() for c in invalid)
+    if rank[0] == 2:
+        return "incomplete: no issuer found"
+    if rank[0] == 1 and best_rank[0] == 0:
+        return "ends at an untrusted root"
+    return "longer than the selected path" if rank[2] > best_rank[2] else "equivalent alternative"
+
+def build_chain(certs, sources, fallbacks=(), anchors=None, max_depth=MAX_CHAIN_DEPTH,
+                max_expansions=MAX_EXPANSIONS, now=None):
+    """Choose the best issuer path from the leaf in ``certs`` using a bounded best-first search.
+
+    Edges come from ``sources`` (and ``fallbacks``) exposing ``candidates(cert)``, plus the
+    other certificates in ``certs``. Complete paths ending at a self-signed certificate
+    contained in ``anchors`` win, then paths with fewer certificates outside their validity
+    period, then shorter paths. The search runs until it runs out of paths; ``max_expansions``
+    caps how many certificates are expanded, after which only the paths already reaching a
+    root are still considered. Every other path explored is returned in ``rejected``.
+    """
+    if not certs:
+        raise ValueError("No valid certificate found")
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    leaf = pick_leaf(certs)
+    bundle = TrustIndex(c for c in certs if c is not leaf)
+    graph = _IssuerGraph([bundle] + list(sources), list(fallbacks))
+    counter = itertools.count()
+    heap = [(1, 0, next(counter), (leaf,), frozenset([fingerprint(leaf)]))]
+    terminals = []
+    expansions = 0
+    while heap:
+        _, _, _, path, seen = heapq.heappop(heap)
+        current = path[-1]
+        if is_self_signed(current) or len(path) >= max_depth:
+            terminals.append(path)
+            continue
+        if expansions >= max_expansions:
+            continue
+        expansions += 1
+        extended = False
+        for issuer in graph.issuers(current):
+            fp = fingerprint(issuer)
+            if fp in seen:
+                continue
+            extended = True
+            invalid = sum(not is_valid_at(c, now) for c in path + (issuer,))
+            heapq.heappush(heap, (len(path) + 1, invalid, next(counter), path + (issuer,), seen | {fp}))
+        if not extended:
+            terminals.append(path)
+    if not terminals:
+        terminals.append((leaf,))
+    ranked = sorted((_path_rank(path, anchors, now) + (path,) for path in terminals), key=lambda r: r[0])
+    best_rank, trusted, _, best = ranked[0]
+    rejected = [RejectedPath(list(path), _rejection_reason(rank, invalid, best_rank))
+                for rank, _, invalid, path in ranked[1:]]
+    return ChainResult(list(best), is_self_signed(best[-1]), trusted, rejected)
+
+def write_chain(chain, path):
+    with span("write.chain"):
+        with open(path, "wb") as f:
+            for c in chain:
+                f.write(c.public_bytes(serialization.Encoding.PEM))
+    return path
+
+def chain_output_name(source_path, leaf):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return f"{stem}.{fingerprint(leaf).hex()[:12]}.FullChain.cer"
@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+def cmd_chain(args):
+    if not args.inputs and not args.manifest:
+        print("chain: give certificate paths or --manifest", file=sys.stderr)
+        return 2
+    from .batch import iter_input_paths, run_chain_batch
+    counts = {"ok": 0, "incomplete": 0, "error": 0}
+    workers = {}
+    paths = iter_input_paths(args.inputs, args.manifest)
+    for result in run_chain_batch(paths, args.output_dir, workers=args.workers, trust_sources=args.trust,
+                                  use_system_store=not args.no_system_store, use_aia=not args.no_aia,
+                                  use_learned=not args.no_learned):
+        worker = result.pop("_worker", None)
+        if worker:
+            workers[worker["pid"]] = worker
+        counts[result["status"]] += 1
+        print(json.dumps(result), flush=True)
+    verify_cache = {k: sum(w[k] for w in workers.values()) for k in ("hits", "misses")}
+    print(json.dumps({"summary": counts, "verify_cache": verify_cache}), file=sys.stderr)
+    return 0 if counts["error"] == 0 and counts["incomplete"] == 0 else 1
+
+def cmd_csr(args):
+    from .batch import read_csr_manifest, run_csr_batch
+    counts = {"ok": 0, "error": 0}
+    for result in run_csr_batch(read_csr_manifest(args.manifest), args.output_dir, workers=args.workers):
+        counts[result["status"]] += 1
+        print(json.dumps(result), flush=True)
+    print(json.dumps({"summary": counts}), file=sys.stderr)
+    return 0 if counts["error"] == 0 else 1
+
+def cmd_pfx(args):
+    from .batch import PFX_EXTENSIONS, iter_input_paths, read_password_list, run_pfx_batch
+    passwords = list(args.password)
+    if args.passwords:
+        passwords += read_password_list(args.passwords)
+    counts = {"ok": 0, "error": 0}
+    for result in run_pfx_batch(iter_input_paths(args.inputs, extensions=PFX_EXTENSIONS), passwords, args.output_dir, workers=args.workers,
+                                use_learned=not args.no_learned):
+        counts[result["status"]] += 1
+        print(json.dumps(result), flush=True)
+    print(json.dumps({"summary": counts}), file=sys.stderr)
+    return 0 if counts["error"] == 0 else 1
+
+def cmd_serve(args):
+    from .service import ChainService, serve
+    service = ChainService(trust_sources=args.trust, use_system_store=not args.no_system_store, use_aia=not args.no_aia,
+                           use_learned=not args.no_learned)
+    token = args.token or os.environ.get("AIOSSL_SERVICE_TOKEN")
+    print(json.dumps({"listening": f"http://{args.host}:{args.port}", "trust_index_size": len(service.trust_index)}),
+          file=sys.stderr, flush=True)
+    try:
+        serve(service, args.host, args.port, max_inflight=args.max_inflight, refresh_interval=args.refresh_interval,
+              token=token, verbose=args.verbose)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def cmd_inventory_scan(args):
+    from .inventory import Inventory
+    counts = {}
+    with Inventory(args.db) as inventory:
+        for result in inventory.scan(args.roots, workers=args.workers, trust_sources=args.trust,
+                                     use_system_store=not args.no_system_store, use_aia=not args.no_aia,
+                                     use_learned=not args.no_learned, force=args.force, counts=counts):
+            if args.verbose or result["status"] != "unchanged":
+                result.pop("certificates", None)
+                print(json.dumps(result), flush=True)
+        summary = inventory.summary()
+    print(json.dumps({"scan": counts, "summary": summary}), file=sys.stderr)
+    return 0 if counts["error"] == 0 else 1
+
+def cmd_inventory_query(args):
+    from .inventory import Inventory, CERT_COLUMNS
+    with Inventory(args.db) as inventory:
+        rows = inventory.query(expiring_days=args.expiring, expired=args.expired, issuer=args.issuer,
+                               subject=args.subject, san=args.san, fingerprint=args.fingerprint,
+                               incomplete=args.incomplete, untrusted=args.untrusted, include_ca=not args.leaves_only,
+                               limit=args.limit)
+    if args.csv:
+        import csv
+        writer = csv.DictWriter(sys.stdout, fieldnames=CERT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            print(json.dumps(row))
+    return 0
+
+def _existing_path(value):
+    if not os.path.exists(value):
+        raise argparse.ArgumentTypeError(f"no such file or directory: {value}")
+    return value
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="aio-ssl-tool", description="Headless AIO SSL Tool operations")
+    parser.add_argument("--perf-log", help="Append per-stage timings as JSON lines to this file")
+    parser.add_argument("--profile-dir", help="Write a cProfile .prof file per operation into this directory")
+    trust = argparse.ArgumentParser(add_help=False)
+    trust.add_argument("--trust", action="append", default=[], type=_existing_path,
+                       help="Extra trusted certificate file or directory tree (repeatable)")
+    trust.add_argument("--no-system-store", action="store_true", help="Do not use the Windows certificate stores")
+    trust.add_argument("--no-aia", action="store_true", help="Do not download issuers from AIA URLs")
+    trust.add_argument("--no-learned", action="store_true", help="Do not use or add to the learned intermediates pool")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("chain", parents=[trust], help="Build full chains for many certificates")
+    p.add_argument("inputs", nargs="*", help="Certificate files or directories")
+    p.add_argument("-m", "--manifest", help="Text file listing one certificate path per line")
+    p.add_argument("-o", "--output-dir", required=True, help="Directory for the per-certificate FullChain files")
+    p.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    p.set_defaults(func=cmd_chain)
+    p = sub.add_parser("csr", help="Generate private keys and CSRs from a CSV or JSON manifest")
+    p.add_argument("manifest", help="CSV with a header row, or JSON list of entries")
+    p.add_argument("-o", "--output-dir", required=True, help="Directory for <name>.key.pem, <name>.csr.pem and csr_report.csv")
+    p.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    p.set_defaults(func=cmd_csr)
+    p = sub.add_parser("pfx", help="Unpack many PFX/P12 files, trying a list of candidate passwords")
+    p.add_argument("inputs", nargs="+", help="PFX/P12 files or directories")
+    p.add_argument("-P", "--passwords", help="File with one candidate password per line")
+    p.add_argument("-p", "--password", action="append", default=[], help="Candidate password (repeatable)")
+    p.add_argument("-o", "--output-dir", required=True, help="Directory for the key/cert/chain files and pfx_report.csv")
+    p.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    p.add_argument("--no-learned", action="store_true", help="Do not add the files' intermediates to the learned pool")
+    p.set_defaults(func=cmd_pfx)
+    p = sub.add_parser("serve", parents=[trust], help="Run a local chain/PFX/CSR service with a warm trust index")
+    p.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--max-inflight", type=int, default=16, help="Concurrent requests before answering 503")
+    p.add_argument("--refresh-interval", type=int, default=300, help="Seconds between trust store change checks (0 = never)")
+    p.add_argument("--token", help="Require 'Authorization: Bearer <token>' (or set AIOSSL_SERVICE_TOKEN)")
+    p.add_argument("-v", "--verbose", action="store_true", help="Log every request to stderr")
+    p.set_defaults(func=cmd_serve)
+    p = sub.add_parser("inventory", help="Index the certificates under directory trees and query the index")
+    inventory = p.add_subparsers(dest="inventory_command", required=True)
+    p = inventory.add_parser("scan", parents=[trust], help="Incrementally (re)scan files and directories into the index")
+    p.add_argument("roots", nargs="+", help="Certificate files or directories")
+    p.add_argument("--db", help="Index file (default: inventory.sqlite in the cache directory)")
+    p.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    p.add_argument("--force", action="store_true", help="Re-read every file, e.g. after the trust store changed")
+    p.add_argument("-v", "--verbose", action="store_true", help="Also print files skipped as unchanged")
+    p.set_defaults(func=cmd_inventory_scan)
+    p = inventory.add_parser("query", help="List indexed certificates matching every given filter")
+    p.add_argument("--db", help="Index file (default: inventory.sqlite in the cache directory)")
+    p.add_argument("--expiring", type=float, metavar="DAYS", help="Still valid but expiring within DAYS days")
+    p.add_argument("--expired", action="store_true", help="Already expired")
+    p.add_argument("--issuer", help="Issuer DN contains this text (case-insensitive)")
+    p.add_argument("--subject", help="Subject DN contains this text (case-insensitive)")
+    p.add_argument("--san", help="A subject alternative name contains this text (case-insensitive)")
+    p.add_argument("--fingerprint", help="SHA-256 fingerprint (hex, colons allowed)")
+    p.add_argument("--incomplete", action="store_true", help="Chain could not be completed")
+    p.add_argument("--untrusted", action="store_true", help="Chain does not end at a trusted root")
+    p.add_argument("--leaves-only", action="store_true", help="Skip CA certificates")
+    p.add_argument("--limit", type=int)
+    p.add_argument("--csv", action="store_true", help="Write CSV instead of JSON lines")
+    p.set_defaults(func=cmd_inventory_query)
+    return parser
+
+def main(argv=None, started=None):
+    args = build_parser().parse_args(argv)
+    from .timing import set_perf_log, set_profile_dir, record
+    if args.perf_log:
+        set_perf_log(args.perf_log)
+    if args.profile_dir:
+        set_profile_dir(args.profile_dir)
+    if started is not None:
+        record("startup.cli", time.perf_counter() - started, command=args.command)
+    return args.func(args)
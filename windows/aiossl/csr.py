@@ -0,0 +1,48 @@
+import os
+from cryptography import x509
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.x509.oid import NameOID
+from .keys import signature_hash
+from .timing import span
+
+SUBJECT_FIELDS = [
+    (NameOID.COUNTRY_NAME, "Country"),
+    (NameOID.STATE_OR_PROVINCE_NAME, "State/Province"),
+    (NameOID.LOCALITY_NAME, "Locality"),
+    (NameOID.ORGANIZATION_NAME, "Organization"),
+    (NameOID.ORGANIZATIONAL_UNIT_NAME, "Organizational Unit"),
+    (NameOID.COMMON_NAME, "Common Name"),
+    (NameOID.EMAIL_ADDRESS, "Email Address"),
+]
+
+def build_subject(data):
+    attrs = [x509.NameAttribute(oid, data.get(field)) for oid, field in SUBJECT_FIELDS if data.get(field)]
+    return x509.Name(attrs or [x509.NameAttribute(NameOID.COMMON_NAME, "default")])
+
+def build_csr(key, data, sans):
+    builder = x509.CertificateSigningRequestBuilder().subject_name(build_subject(data))
+    if sans:
+        builder = builder.add_extension(x509.SubjectAlternativeName([x509.DNSName(s) for s in sans]), critical=False)
+    with span("csr.sign"):
+        return builder.sign(key, signature_hash(key), default_backend())
+
+def key_and_csr_pem(key, csr, password=""):
+    enc = serialization.BestAvailableEncryption(password.encode()) if password else serialization.NoEncryption()
+    # EdDSA keys have no traditional (PKCS#1 / SEC1) encoding, only PKCS#8.
+    traditional = isinstance(key, (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey))
+    fmt = serialization.PrivateFormat.TraditionalOpenSSL if traditional else serialization.PrivateFormat.PKCS8
+    return (key.private_bytes(serialization.Encoding.PEM, fmt, enc),
+            csr.public_bytes(serialization.Encoding.PEM))
+
+def write_key_and_csr(key, csr, directory, password="", key_name="private_key.pem", csr_name="csr.pem"):
+    priv_path = os.path.join(directory, key_name)
+    csr_path = os.path.join(directory, csr_name)
+    key_pem, csr_pem = key_and_csr_pem(key, csr, password)
+    with span("write.key_csr"):
+        with open(priv_path, "wb") as f:
+            f.write(key_pem)
+        with open(csr_path, "wb") as f:
+            f.write(csr_pem)
+    return priv_path, csr_path
@@ -0,0 +1,256 @@
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from .batch import CERT_EXTENSIONS, bounded_map, chain_context, iter_input_paths
+from .certs import (load_certificates, fingerprint, is_ca_certificate, is_self_signed, subject_alt_names,
+                    validity_window, describe_bad_blocks)
+from .chain import build_chain
+from .paths import cache_path
+from .timing import operation, span
+from .trust import TrustIndex
+
+SCHEMA_VERSION = 1
+INVENTORY_NAME = "inventory.sqlite"
+INVENTORY_EXTENSIONS = CERT_EXTENSIONS + (".p7b", ".p7c")
+COMMIT_EVERY = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT,
+    scanned_at REAL NOT NULL,
+    certificates INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS certificates (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    issuer TEXT NOT NULL,
+    sans TEXT NOT NULL,
+    serial TEXT NOT NULL,
+    key_type TEXT NOT NULL,
+    not_before INTEGER NOT NULL,
+    not_after INTEGER NOT NULL,
+    is_ca INTEGER NOT NULL,
+    self_signed INTEGER NOT NULL,
+    chain_status TEXT NOT NULL,
+    chain_depth INTEGER NOT NULL,
+    trusted INTEGER NOT NULL,
+    PRIMARY KEY (path, position)
+);
+CREATE INDEX IF NOT EXISTS certificates_not_after ON certificates (not_after);
+CREATE INDEX IF NOT EXISTS certificates_fingerprint ON certificates (fingerprint);
+CREATE INDEX IF NOT EXISTS certificates_chain ON certificates (chain_status, trusted);
+"""
+
+CERT_COLUMNS = ("path", "position", "fingerprint", "subject", "issuer", "sans", "serial", "key_type", "not_before",
+                "not_after", "is_ca", "self_signed", "chain_status", "chain_depth", "trusted")
+
+def key_type(cert):
+    key = cert.public_key()
+    if isinstance(key, rsa.RSAPublicKey):
+        return f"RSA {key.key_size}"
+    if isinstance(key, ec.EllipticCurvePublicKey):
+        return f"EC {key.curve.name}"
+    return type(key).__name__.lstrip("_").replace("PublicKey", "")
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+_worker = {}
+
+def init_inventory_worker(trust_sources=(), use_system_store=True, use_aia=True, use_learned=True):
+    _worker.update(chain_context(trust_sources, use_system_store, use_aia, use_learned))
+
+def describe_certificate(cert, bundle):
+    """One ``certificates`` row (without path/position); the chain is built from ``cert`` using the rest of its file."""
+    result = build_chain([cert], [bundle] + _worker["sources"], _worker["fallbacks"], _worker["anchors"])
+    not_before, not_after = validity_window(cert)
+    return {
+        "fingerprint": fingerprint(cert).hex(),
+        "subject": cert.subject.rfc4514_string(),
+        "issuer": cert.issuer.rfc4514_string(),
+        "sans": ",".join(subject_alt_names(cert)),
+        "serial": format(cert.serial_number, "x"),
+        "key_type": key_type(cert),
+        "not_before": int(not_before.timestamp()),
+        "not_after": int(not_after.timestamp()),
+        "is_ca": int(is_ca_certificate(cert)),
+        "self_signed": int(is_self_signed(cert)),
+        "chain_status": result.status,
+        "chain_depth": result.depth,
+        "trusted": int(result.trusted),
+    }
+
+def inventory_one(task):
+    """Hash one file and, unless it matches ``known_sha256`` (or ``force``), parse it and evaluate every chain."""
+    path, mtime_ns, size, known_sha256, force = task
+    start = time.perf_counter()
+    result = {"path": path, "mtime_ns": mtime_ns, "size": size, "certificates": []}
+    try:
+        with operation("inventory.file", path=path):
+            with open(path, "rb") as f:
+                data = f.read()
+            with span("inventory.hash"):
+                result["sha256"] = file_digest(data)
+            if result["sha256"] == known_sha256 and not force:
+                result["status"] = "unchanged"
+            else:
+                errors = []
+                certs = load_certificates(data, errors)
+                if not certs:
+                    raise ValueError("No valid certificate found" + (":\n" + describe_bad_blocks(errors) if errors else ""))
+                if _worker["learned"] is not None:
+                    _worker["learned"].learn(certs)
+                bundle = TrustIndex(certs)
+                result["certificates"] = [describe_certificate(cert, bundle) for cert in certs]
+                result["status"] = "updated" if known_sha256 else "added"
+    except Exception as e:
+        result.update(status="error", error=str(e))
+    result["elapsed"] = round(time.perf_counter() - start, 4)
+    return result
+
+class Inventory:
+    """SQLite index of the certificates found on disk: one ``files`` row per scanned file and one
+    ``certificates`` row per certificate in it, with expiry, issuer, SANs and chain status.
+    """
+    def __init__(self, path=None):
+        self.path = path or cache_path(INVENTORY_NAME)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS certificates; DROP TABLE IF EXISTS files;")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    def close(self):
+        self.db.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        self.close()
+    def _pending(self, roots, force, counts, seen):
+        known = {row["path"]: row for row in self.db.execute("SELECT path, mtime_ns, size, sha256 FROM files")}
+        for path in iter_input_paths(roots, extensions=INVENTORY_EXTENSIONS):
+            path = os.path.abspath(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            seen.add(path)
+            row = known.get(path)
+            if row is not None and not force and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+                counts["unchanged"] += 1
+                continue
+            yield path, st.st_mtime_ns, st.st_size, row["sha256"] if row is not None else None, force
+    def _store(self, result):
+        now = time.time()
+        if result["status"] == "unchanged":
+            self.db.execute("UPDATE files SET mtime_ns = ?, size = ?, scanned_at = ? WHERE path = ?",
+                            (result["mtime_ns"], result["size"], now, result["path"]))
+            return
+        self.db.execute("DELETE FROM certificates WHERE path = ?", (result["path"],))
+        self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (result["path"], result["mtime_ns"], result["size"], result.get("sha256"), now,
+                         len(result["certificates"]), result.get("error")))
+        self.db.executemany(f"INSERT INTO certificates VALUES ({', '.join('?' * len(CERT_COLUMNS))})",
+                            [tuple(dict(row, path=result["path"], position=i)[c] for c in CERT_COLUMNS)
+                             for i, row in enumerate(result["certificates"])])
+    def _prune(self, roots, seen):
+        removed = []
+        for root in roots:
+            # A root may be a file or a directory tree, and may no longer exist at all, so match both
+            # the exact path and everything under it.
+            root = os.path.abspath(root)
+            prefix = os.path.join(root, "")
+            for (path,) in self.db.execute("SELECT path FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+                                           (root, len(prefix), prefix)):
+                if path not in seen:
+                    removed.append(path)
+        self.db.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+        return removed
+    def scan(self, roots, workers=None, trust_sources=(), use_system_store=True, use_aia=True, use_learned=True,
+             force=False, counts=None):
+        """Bring the index up to date for ``roots``, yielding a result dict for every file that had to be read.
+
+        Files whose mtime and size match the index are skipped without being opened; files whose
+        content hash still matches only have their stat refreshed. Everything else is parsed and
+        its chains evaluated across a process pool. Indexed files that disappeared from ``roots``
+        are removed. ``force`` re-evaluates every file, e.g. after the trust store changed.
+        Per-status totals are accumulated into ``counts`` when given.
+        """
+        counts = counts if counts is not None else {}
+        for status in ("added", "updated", "unchanged", "removed", "error"):
+            counts.setdefault(status, 0)
+        seen = set()
+        workers = workers or os.cpu_count() or 1
+        pending = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_inventory_worker,
+                                 initargs=(tuple(trust_sources), use_system_store, use_aia, use_learned)) as pool:
+            try:
+                for result in bounded_map(pool, inventory_one, self._pending(roots, force, counts, seen), workers * 4):
+                    self._store(result)
+                    counts[result["status"]] += 1
+                    pending += 1
+                    if pending >= COMMIT_EVERY:
+                        self.db.commit()
+                        pending = 0
+                    yield result
+            finally:
+                self.db.commit()
+        for path in self._prune(roots, seen):
+            counts["removed"] += 1
+            yield {"path": path, "status": "removed"}
+        self.db.commit()
+    def query(self, expiring_days=None, expired=False, issuer=None, subject=None, san=None, fingerprint=None,
+              incomplete=False, untrusted=False, include_ca=True, limit=None, now=None):
+        """Indexed certificates matching every given filter, soonest expiry first.
+
+        ``issuer``, ``subject`` and ``san`` are case-insensitive substring matches;
+        ``expiring_days`` selects certificates still valid but expiring within that many days.
+        """
+        now = int(now or time.time())
+        where, params = [], []
+        if expiring_days is not None:
+            where.append("not_after BETWEEN ? AND ?")
+            params += [now, now + int(expiring_days * 86400)]
+        if expired:
+            where.append("not_after < ?")
+            params.append(now)
+        for column, value in (("issuer", issuer), ("subject", subject), ("sans", san)):
+            if value:
+                where.append(f"{column} LIKE ? ESCAPE '\\'")
+                params.append("%" + value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if fingerprint:
+            where.append("fingerprint = ?")
+            params.append(fingerprint.lower().replace(":", ""))
+        if incomplete:
+            where.append("chain_status = 'incomplete'")
+        if untrusted:
+            where.append("trusted = 0")
+        if not include_ca:
+            where.append("is_ca = 0")
+        sql = "SELECT * FROM certificates" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY not_after, path, position"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with span("inventory.query"):
+            return [dict(row) for row in self.db.execute(sql, params)]
+    def summary(self, expiring_days=30, now=None):
+        now = int(now or time.time())
+        row = self.db.execute(
+            "SELECT COUNT(*) AS certificates,"
+            " COALESCE(SUM(not_after < ?), 0) AS expired,"
+            " COALESCE(SUM(not_after BETWEEN ? AND ?), 0) AS expiring,"
+            " COALESCE(SUM(chain_status = 'incomplete'), 0) AS incomplete,"
+            " COALESCE(SUM(trusted = 0), 0) AS untrusted FROM certificates",
+            (now, now, now + expiring_days * 86400)).fetchone()
+        files = self.db.execute("SELECT COUNT(*), COALESCE(SUM(error IS NOT NULL), 0) FROM files").fetchone()
+        return dict(row, files=files[0], unreadable=files[1], expiring_days=expiring_days)
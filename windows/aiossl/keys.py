@@ -0,0 +1,106 @@
+import re
+import threading
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+from .timing import span
+
+RSA_KEY_SIZES = (2048, 3072, 4096)
+EC_CURVES = {"p256": ec.SECP256R1, "p384": ec.SECP384R1}
+KEY_TYPES = ("rsa2048", "rsa3072", "rsa4096", "p256", "p384", "ed25519")
+KEY_TYPE_LABELS = {"rsa2048": "RSA 2048", "rsa3072": "RSA 3072", "rsa4096": "RSA 4096",
+                   "p256": "ECDSA P-256", "p384": "ECDSA P-384", "ed25519": "Ed25519"}
+DEFAULT_KEY_TYPE = "rsa2048"
+_ALIASES = {"ecp256": "p256", "secp256r1": "p256", "prime256v1": "p256", "ecp384": "p384", "secp384r1": "p384"}
+
+def key_type_name(value):
+    """The ``KEY_TYPES`` name for a name, a GUI label or alias ("ECDSA P-256", "secp384r1") or an RSA size."""
+    text = re.sub(r"[\s_-]+", "", str(value)).lower().replace("ecdsa", "")
+    if text.isdigit():
+        text = "rsa" + text
+    text = _ALIASES.get(text, text)
+    if text not in KEY_TYPES:
+        raise ValueError(f"Unsupported key type: {value}")
+    return text
+
+def generate_private_key(key_type=DEFAULT_KEY_TYPE):
+    name = key_type_name(key_type)
+    if name in EC_CURVES:
+        with span("keygen.ec", curve=name):
+            return ec.generate_private_key(EC_CURVES[name](), default_backend())
+    if name == "ed25519":
+        with span("keygen.ed25519"):
+            return ed25519.Ed25519PrivateKey.generate()
+    bits = int(name[3:])
+    with span("keygen.rsa", bits=bits):
+        return rsa.generate_private_key(65537, bits, default_backend())
+
+def signature_hash(key):
+    """Digest to sign with ``key``: none for EdDSA, SHA-384 for P-384 and larger curves, SHA-256 otherwise."""
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed448.Ed448PrivateKey)):
+        return None
+    if isinstance(key, ec.EllipticCurvePrivateKey) and key.curve.key_size >= 384:
+        return hashes.SHA384()
+    return hashes.SHA256()
+
+class KeyPool:
+    """Pre-generates private keys of one type on a background thread.
+
+    The pool holds at most ``max_size`` keys, all of the most recently requested
+    type; changing the type or closing the pool drops every unused key.
+    """
+    def __init__(self, max_size=2, generate=generate_private_key):
+        self.max_size = max_size
+        self._generate = generate
+        self._key_type = None
+        self._keys = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+    def prefill(self, key_type):
+        key_type = key_type_name(key_type)
+        with self._lock:
+            if self._closed:
+                return
+            if key_type != self._key_type:
+                self._keys.clear()
+                self._key_type = key_type
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="KeyPool", daemon=True)
+                self._thread.start()
+        self._wake.set()
+    def take(self, key_type):
+        """A pooled key of ``key_type`` if one is ready, otherwise a freshly generated one."""
+        key_type = key_type_name(key_type)
+        with self._lock:
+            key = self._keys.pop() if key_type == self._key_type and self._keys else None
+        self._wake.set()
+        return key if key is not None else self._generate(key_type)
+    def available(self, key_type):
+        key_type = key_type_name(key_type)
+        with self._lock:
+            return len(self._keys) if key_type == self._key_type else 0
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._keys.clear()
+            self._key_type = None
+        self._wake.set()
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while True:
+                with self._lock:
+                    if self._closed:
+                        return
+                    key_type = self._key_type
+                    if key_type is None or len(self._keys) >= self.max_size:
+                        break
+                key = self._generate(key_type)
+                with self._lock:
+                    if self._closed:
+                        return
+                    if key_type == self._key_type and len(self._keys) < self.max_size:
+                        self._keys.append(key)
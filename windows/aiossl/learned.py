@@ -0,0 +1,157 @@
+import base64
+import json
+import os
+import threading
+import time
+from multiprocessing import util
+from .certs import fingerprint, is_ca_certificate, is_self_signed, validity_window
+from .paths import cache_path, file_lock
+from .timing import span
+from .trust import TrustIndex
+
+POOL_VERSION = 1
+POOL_NAME = "learned-intermediates.json"
+MAX_POOL_SIZE = 5000
+FLUSH_INTERVAL = 60
+
+class IntermediatePool(TrustIndex):
+    """Intermediate CAs remembered from input bundles, PFX files and completed chains.
+
+    Entries are deduplicated by fingerprint and looked up like any ``TrustIndex``. Expired
+    certificates are dropped and, past ``max_size``, the least recently used go first.
+    With a ``path``, additions are written back by ``flush()`` (merged with what other processes
+    saved), which callers run once per batch, on a timer or at exit rather than per certificate.
+    The pool is only a source of candidate issuers, never a trust anchor.
+    """
+    def __init__(self, path=None, max_size=MAX_POOL_SIZE):
+        super().__init__()
+        self.path = path
+        self.max_size = max_size
+        self._not_after = {}
+        self._used = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        if path:
+            with span("learned.load"):
+                for entry in self._read():
+                    self._restore(*entry)
+                self.evict()
+    def add(self, cert):
+        with self._lock:
+            if not super().add(cert):
+                return False
+            fp = fingerprint(cert)
+            self._not_after[fp] = validity_window(cert)[1].timestamp()
+            self._used[fp] = time.time()
+            return True
+    def _restore(self, der, subject, ski, fp, not_after, used):
+        if self._add_entry(der, subject, ski, fp):
+            self._not_after[fp] = not_after
+            self._used[fp] = used
+    def _remove_entry(self, fp):
+        super()._remove_entry(fp)
+        self._not_after.pop(fp, None)
+        self._used.pop(fp, None)
+    def candidates(self, cert):
+        with span("lookup.learned"), self._lock:
+            found = self._candidates(cert)
+            now = time.time()
+            for candidate in found:
+                self._used[fingerprint(candidate)] = now
+            return found
+    def learn(self, certs, now=None):
+        """Remember the unexpired, non-root CA certificates in ``certs``; returns how many were new."""
+        now = now or time.time()
+        added = 0
+        with self._lock:
+            for cert in certs:
+                if (is_ca_certificate(cert) and not is_self_signed(cert)
+                        and validity_window(cert)[1].timestamp() > now and self.add(cert)):
+                    added += 1
+            if added:
+                self.evict(now)
+                self._dirty = True
+        return added
+    def flush(self):
+        """Save if anything was learned since the last save; returns True if the file was written."""
+        with self._lock:
+            if not self._dirty or not self.path:
+                return False
+            try:
+                self.save()
+            except OSError:
+                return False
+            self._dirty = False
+            return True
+    def start_flusher(self, interval=FLUSH_INTERVAL):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.flush()
+        threading.Thread(target=loop, name="LearnedPoolFlusher", daemon=True).start()
+    def evict(self, now=None):
+        """Drop expired entries, then the least recently used ones beyond ``max_size``; returns the count."""
+        now = now or time.time()
+        with self._lock:
+            doomed = {fp for fp, not_after in self._not_after.items() if not_after <= now}
+            excess = len(self._entries) - len(doomed) - self.max_size
+            if excess > 0:
+                alive = sorted((fp for fp in self._entries if fp not in doomed), key=lambda fp: self._used.get(fp, 0))
+                doomed.update(alive[:excess])
+            for fp in doomed:
+                self._remove_entry(fp)
+            return len(doomed)
+    def _read(self):
+        dec = lambda s: base64.b64decode(s) if s is not None else None
+        try:
+            with open(self.path) as f:
+                payload = json.load(f)
+            if payload.get("version") != POOL_VERSION:
+                return []
+            return [(dec(der), dec(subject), dec(ski), bytes.fromhex(fp), not_after, used)
+                    for der, subject, ski, fp, not_after, used in payload["entries"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+    def save(self):
+        """Write the pool to ``path``, first merging in entries other processes have saved meanwhile.
+
+        The read-merge-write runs under a lock file, so batch workers flushing together at exit
+        do not overwrite each other's additions.
+        """
+        enc = lambda b: base64.b64encode(b).decode("ascii") if b is not None else None
+        with span("learned.save"), self._lock, file_lock(self.path + ".lock"):
+            for entry in self._read():
+                self._restore(*entry)
+            self.evict()
+            payload = {
+                "version": POOL_VERSION,
+                "entries": [[enc(der), enc(subject), enc(ski), fp.hex(), self._not_after[fp], self._used[fp]]
+                            for fp, (der, subject, ski) in self._entries.items()],
+            }
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+
+def learn_from_chain(pool, certs, result):
+    """Feed ``pool`` the CA certificates of an input bundle and, if it completed, of the built chain."""
+    return pool.learn(list(certs) + (result.chain if result.complete else []))
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+def get_learned_pool():
+    """Process-wide pool persisted in the cache directory, loaded on first use and flushed at exit.
+
+    The exit hook also runs in multiprocessing workers, so batch workers save once when their pool shuts down.
+    """
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            try:
+                path = cache_path(POOL_NAME)
+            except OSError:
+                path = None
+            _default_pool = IntermediatePool(path)
+            util.Finalize(_default_pool, _default_pool.flush, exitpriority=10)
+        return _default_pool
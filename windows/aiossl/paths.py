@@ -0,0 +1,48 @@
+import contextlib
+import os
+import sys
+
+LOCK_ATTEMPTS = 6
+
+def cache_dir():
+    path = os.environ.get("AIOSSL_CACHE_DIR")
+    if not path:
+        if sys.platform == "win32":
+            base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+            path = os.path.join(base, "AIOSSLTool", "cache")
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            path = os.path.join(base, "aiossl")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def cache_path(name):
+    return os.path.join(cache_dir(), name)
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on the lock file ``path`` across processes for the ``with`` block."""
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+            # LK_LOCK itself retries for about 10 seconds before giving up with OSError.
+            for attempt in range(LOCK_ATTEMPTS):
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    if attempt == LOCK_ATTEMPTS - 1:
+                        raise
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,26 @@
+from cryptography.hazmat.primitives import serialization
+from .certs import verify_signature
+from .timing import span
+
+def broken_chain_links(certs):
+    """Indexes ``i`` where ``certs[i]`` is not signed by ``certs[i + 1]``."""
+    return [i for i in range(len(certs) - 1) if not verify_signature(certs[i], certs[i + 1])]
+
+def key_matches_certificate(key, cert):
+    fmt = (serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+    return key.public_key().public_bytes(*fmt) == cert.public_key().public_bytes(*fmt)
+
+def serialize_pfx(key, certs, password, name=b"certificate"):
+    if not certs:
+        raise ValueError("No certificates to pack")
+    if not key_matches_certificate(key, certs[0]):
+        raise ValueError("Private key does not match the leaf certificate")
+    from cryptography.hazmat.primitives.serialization import pkcs12
+    with span("pkcs12.encode"):
+        return pkcs12.serialize_key_and_certificates(
+            name=name,
+            key=key,
+            cert=certs[0],
+            cas=certs[1:] or None,
+            encryption_algorithm=serialization.BestAvailableEncryption(password)
+        )
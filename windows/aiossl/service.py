@@ -0,0 +1,268 @@
+import base64
+import hmac
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from cryptography.hazmat.primitives import serialization
+from .certs import load_certificates, describe_bad_blocks, verify_cache_stats
+from .chain import build_chain, default_sources
+from .csr import build_csr, key_and_csr_pem
+from .keys import DEFAULT_KEY_TYPE, KeyPool, key_type_name
+from .learned import learn_from_chain
+from .pfx import serialize_pfx
+from .timing import operation, totals
+from .trust import iter_certificate_files, load_trust_index, windows_store_ders, store_digest
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+class ChainService:
+    """Chain completion, PFX packing and CSR generation over a trust index kept warm in memory.
+
+    The index is swapped for a fresh one whenever the Windows stores or the extra
+    ``trust_sources`` change; the AIA cache, verification cache, learned intermediates and
+    key pool persist for the life of the process.
+    """
+    def __init__(self, trust_sources=(), use_system_store=True, use_aia=True, use_learned=True, key_pool_size=4,
+                 default_key_type=DEFAULT_KEY_TYPE):
+        self.trust_sources = list(trust_sources)
+        self.use_system_store = use_system_store
+        self.default_key_type = key_type_name(default_key_type)
+        self.fetcher = None
+        if use_aia:
+            from .aia import get_default_fetcher
+            self.fetcher = get_default_fetcher()
+        self.learned = None
+        if use_learned:
+            from .learned import get_learned_pool
+            self.learned = get_learned_pool()
+        self.key_pool = KeyPool(max_size=key_pool_size) if key_pool_size else None
+        if self.key_pool:
+            self.key_pool.prefill(self.default_key_type)
+        self.started = time.time()
+        self.refreshed = None
+        self._signature = None
+        self.trust_index = None
+        self.refresh()
+    def _sources_signature(self):
+        stamps = []
+        for source in self.trust_sources:
+            paths = iter_certificate_files(source) if os.path.isdir(source) else [source]
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                    stamps.append((path, st.st_mtime_ns, st.st_size))
+                except OSError:
+                    continue
+        store = store_digest(windows_store_ders()) if self.use_system_store else None
+        return store, tuple(stamps)
+    def refresh(self, force=True):
+        """Rebuild the trust index if its sources changed (or unconditionally with ``force``); returns True if swapped."""
+        signature = self._sources_signature()
+        if not force and signature == self._signature:
+            return False
+        with operation("service.refresh"):
+            index = load_trust_index(self.trust_sources, self.use_system_store)
+        self.trust_index = index
+        self._signature = signature
+        self.refreshed = time.time()
+        return True
+    def start_refresher(self, interval):
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh(force=False)
+                except Exception:
+                    pass
+        threading.Thread(target=loop, name="TrustRefresher", daemon=True).start()
+    def complete_chain(self, data):
+        errors = []
+        with operation("service.chain") as timings:
+            certs = load_certificates(data, errors)
+            if not certs:
+                raise ValueError("No valid certificate found" + (":\n" + describe_bad_blocks(errors) if errors else ""))
+            index = self.trust_index
+            sources, fallbacks = default_sources(index, self.fetcher, self.learned)
+            result = build_chain(certs, sources, fallbacks, anchors=index)
+            if self.learned is not None:
+                learn_from_chain(self.learned, certs, result)
+        return {
+            "status": result.status,
+            "trusted": result.trusted,
+            "depth": result.depth,
+            "chain_pem": b"".join(c.public_bytes(serialization.Encoding.PEM) for c in result.chain).decode("ascii"),
+            "rejected": [{"depth": len(r.chain), "reason": r.reason} for r in result.rejected],
+            "bad_blocks": [list(e) for e in errors],
+            "elapsed_ms": round(timings.elapsed * 1000, 3),
+        }
+    def pack_pfx(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("request body must be a JSON object")
+        for field in ("key", "certificates", "password"):
+            if not isinstance(request.get(field), str):
+                raise ValueError(f"'{field}' must be a string")
+        if not isinstance(request.get("key_password") or "", str):
+            raise ValueError("'key_password' must be a string")
+        with operation("service.pfx"):
+            key_password = request.get("key_password")
+            key = serialization.load_pem_private_key(request["key"].encode(), password=key_password.encode() if key_password else None)
+            certs = load_certificates(request["certificates"].encode())
+            if not certs:
+                raise ValueError("No valid certificate found")
+            if self.learned is not None:
+                self.learned.learn(certs)
+            if request.get("complete_chain", True):
+                index = self.trust_index
+                sources, fallbacks = default_sources(index, self.fetcher, self.learned)
+                certs = build_chain(certs, sources, fallbacks, anchors=index).chain
+            return serialize_pfx(key, certs, request["password"].encode())
+    def generate_csr(self, request):
+        from .batch import MANIFEST_FIELDS, parse_csr_entry
+        if not isinstance(request, dict):
+            raise ValueError("request body must be a JSON object")
+        for field in tuple(MANIFEST_FIELDS) + ("passphrase",):
+            if not isinstance(request.get(field) or "", str):
+                raise ValueError(f"'{field}' must be a string")
+        sans = request.get("sans") or []
+        if not (isinstance(sans, str) or isinstance(sans, list) and all(isinstance(s, str) for s in sans)):
+            raise ValueError("'sans' must be a string or a list of strings")
+        if not isinstance(request.get("key_type") or request.get("key_size") or "", (str, int)):
+            raise ValueError("'key_type' must be a string or an RSA key size")
+        entry = parse_csr_entry(dict(request, key_type=request.get("key_type") or request.get("key_size")
+                                     or self.default_key_type))
+        with operation("service.csr", key_type=entry["key_type"]) as timings:
+            if self.key_pool:
+                key = self.key_pool.take(entry["key_type"])
+            else:
+                from .keys import generate_private_key
+                key = generate_private_key(entry["key_type"])
+            csr = build_csr(key, entry["data"], entry["sans"])
+            key_pem, csr_pem = key_and_csr_pem(key, csr, entry["passphrase"])
+        return {"key_pem": key_pem.decode("ascii"), "csr_pem": csr_pem.decode("ascii"),
+                "elapsed_ms": round(timings.elapsed * 1000, 3)}
+    def stats(self):
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "trust_index_size": len(self.trust_index),
+            "learned_pool_size": len(self.learned) if self.learned is not None else 0,
+            "trust_refreshed": self.refreshed,
+            "verify_cache": verify_cache_stats(),
+            "key_pool_ready": self.key_pool.available(self.default_key_type) if self.key_pool else 0,
+            "timings": totals.totals(),
+        }
+    def close(self):
+        if self.learned is not None:
+            self.learned.flush()
+        if self.key_pool:
+            self.key_pool.close()
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "AIOSSLService/1"
+    protocol_version = "HTTP/1.1"
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    def _send(self, status, body, content_type="application/json", headers=()):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    def _authorized(self):
+        token = self.server.token
+        supplied = (self.headers.get("Authorization") or "").encode()
+        if token and not hmac.compare_digest(supplied, f"Bearer {token}".encode()):
+            # Any request body is left unread, so the connection cannot be reused.
+            self.close_connection = True
+            self._send(401, {"error": "unauthorized"})
+            return False
+        return True
+    def do_GET(self):
+        if not self._authorized():
+            return
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send(200, {"status": "ok"})
+        elif path == "/stats":
+            self._send(200, dict(self.server.service.stats(), inflight=self.server.inflight))
+        else:
+            self._send(404, {"error": "not found"})
+    def do_POST(self):
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send(400, {"error": "invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send(413, {"error": f"request body exceeds {MAX_BODY_BYTES} bytes"})
+            return
+        body = self.rfile.read(length)
+        if not self.server.slots.acquire(blocking=False):
+            self._send(503, {"error": "busy, retry later"}, headers=[("Retry-After", "1")])
+            return
+        try:
+            self.server.track(1)
+            self._route(urlparse(self.path).path, body)
+        finally:
+            self.server.track(-1)
+            self.server.slots.release()
+    def _route(self, path, body):
+        service = self.server.service
+        try:
+            if path == "/chain":
+                self._send(200, service.complete_chain(body))
+            elif path == "/pfx":
+                pfx = service.pack_pfx(json.loads(body))
+                if self.headers.get("Accept") == "application/json":
+                    self._send(200, {"pfx_base64": base64.b64encode(pfx).decode("ascii")})
+                else:
+                    self._send(200, pfx, content_type="application/x-pkcs12")
+            elif path == "/csr":
+                self._send(200, service.generate_csr(json.loads(body)))
+            else:
+                self._send(404, {"error": "not found"})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": str(e) or type(e).__name__})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+class ServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    def __init__(self, address, service, max_inflight=16, token=None, verbose=False):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.slots = threading.BoundedSemaphore(max_inflight)
+        self.inflight = 0
+        self.token = token
+        self.verbose = verbose
+        self._inflight_lock = threading.Lock()
+    def track(self, delta):
+        with self._inflight_lock:
+            self.inflight += delta
+
+def serve(service, host="127.0.0.1", port=DEFAULT_PORT, max_inflight=16, refresh_interval=300, token=None, verbose=False):
+    server = ServiceServer((host, port), service, max_inflight=max_inflight, token=token, verbose=verbose)
+    if refresh_interval:
+        service.start_refresher(refresh_interval)
+    if service.learned is not None:
+        service.learned.start_flusher()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,107 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+class Task:
+    """Handle given to a running job: report progress and check for cancellation through it."""
+    def __init__(self, runner, name, on_progress=None, on_cancel=None):
+        self.name = name
+        self.done = 0
+        self.total = None
+        self.message = None
+        self.future = None
+        self._runner = runner
+        self._on_progress = on_progress
+        self._on_cancel = on_cancel
+        self._progress_pending = False
+        self._cancel = threading.Event()
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+    def cancel(self):
+        self._cancel.set()
+        # A job still waiting for a worker never reaches _run, so finish it here instead.
+        if self.future is not None and self.future.cancel():
+            self._runner._post(self._on_cancel, self)
+            self._runner._finish(self)
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise CancelledError(self.name)
+    def progress(self, done, total=None, message=None):
+        """Record progress; the UI callback is coalesced so a fast job cannot flood the event queue."""
+        self.done, self.total, self.message = done, total, message
+        if self._on_progress is not None and not self._progress_pending:
+            self._progress_pending = True
+            self._runner._post(self._deliver_progress)
+        self.check_cancelled()
+    def _deliver_progress(self):
+        self._progress_pending = False
+        self._on_progress(self)
+
+class TaskRunner:
+    """Runs jobs on a shared thread pool and delivers their callbacks on the UI thread.
+
+    Worker threads never touch the UI: every callback is queued and ``notify()`` is
+    called so the UI can schedule ``dispatch()`` on its own thread, which then runs
+    the queued callbacks in order. ``on_change`` fires whenever a job starts or ends.
+    """
+    def __init__(self, notify, max_workers=4, on_change=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aiossl-task")
+        self._events = queue.SimpleQueue()
+        self._notify = notify
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self.active = []
+    def submit(self, name, fn, *args, on_done=None, on_error=None, on_cancel=None, on_progress=None):
+        """Run ``fn(task, *args)`` in the pool; exactly one of on_done/on_error/on_cancel is called on the UI thread."""
+        task = Task(self, name, on_progress, on_cancel)
+        with self._lock:
+            self.active.append(task)
+        task.future = self._executor.submit(self._run, task, fn, args, on_done, on_error, on_cancel)
+        self._post(self._on_change)
+        return task
+    def _run(self, task, fn, args, on_done, on_error, on_cancel):
+        try:
+            task.check_cancelled()
+            result = fn(task, *args)
+            task.check_cancelled()
+            self._post(on_done, result)
+        except CancelledError:
+            self._post(on_cancel, task)
+        except Exception as e:
+            self._post(on_error, e)
+        finally:
+            self._finish(task)
+    def _finish(self, task):
+        with self._lock:
+            if task not in self.active:
+                return
+            self.active.remove(task)
+        self._post(self._on_change)
+    def _post(self, callback, *args):
+        if callback is None:
+            return
+        self._events.put((callback, args))
+        try:
+            self._notify()
+        except Exception:
+            pass
+    def dispatch(self):
+        """Run every queued callback; call from the UI thread."""
+        while True:
+            try:
+                callback, args = self._events.get_nowait()
+            except queue.Empty:
+                return
+            callback(*args)
+    def running(self, name):
+        with self._lock:
+            return any(t.name == name for t in self.active)
+    def cancel_all(self):
+        with self._lock:
+            tasks = list(self.active)
+        for task in tasks:
+            task.cancel()
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
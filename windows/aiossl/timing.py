@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PERF_LOG_ENV = "AIOSSL_PERF_LOG"
+PROFILE_DIR_ENV = "AIOSSL_PROFILE_DIR"
+
+class Timings:
+    """Per-operation totals for every span name: call count, total and max seconds."""
+    def __init__(self):
+        self.elapsed = None
+        self._stats = {}
+        self._lock = threading.Lock()
+    def add(self, name, seconds):
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                self._stats[name] = [1, seconds, seconds]
+            else:
+                stat[0] += 1
+                stat[1] += seconds
+                stat[2] = max(stat[2], seconds)
+    def totals(self):
+        with self._lock:
+            return {name: {"count": c, "total_ms": round(t * 1000, 3), "max_ms": round(m * 1000, 3)}
+                    for name, (c, t, m) in self._stats.items()}
+    def summary(self, limit=4):
+        """Short human-readable breakdown of the most expensive spans, e.g. for a status label."""
+        with self._lock:
+            top = sorted(self._stats.items(), key=lambda kv: kv[1][1], reverse=True)[:limit]
+        return ", ".join(f"{name} {t * 1000:.0f} ms" + (f" x{c}" if c > 1 else "") for name, (c, t, _) in top)
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+totals = Timings()
+_local = threading.local()
+_log_lock = threading.Lock()
+_log_path = os.environ.get(PERF_LOG_ENV) or None
+_profiler_hook = None
+
+def set_perf_log(path):
+    """Append one JSON object per span and per operation to ``path``; ``None`` turns logging off."""
+    global _log_path
+    _log_path = path or None
+    if path:
+        os.environ[PERF_LOG_ENV] = path
+    else:
+        os.environ.pop(PERF_LOG_ENV, None)
+
+def set_profiler_hook(hook):
+    """Install ``hook(name, fields)`` returning a context manager wrapped around every operation.
+
+    This is how an external profiler is attached, e.g. ``cprofile_hook(directory)``.
+    """
+    global _profiler_hook
+    _profiler_hook = hook
+
+def cprofile_hook(directory):
+    import cProfile
+    os.makedirs(directory, exist_ok=True)
+    @contextmanager
+    def hook(name, fields):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(directory, f"{name}-{os.getpid()}-{time.time_ns()}.prof"))
+    return hook
+
+def set_profile_dir(directory):
+    """Profile every operation with cProfile into ``directory``; inherited by worker processes."""
+    if directory:
+        os.environ[PROFILE_DIR_ENV] = directory
+        set_profiler_hook(cprofile_hook(directory))
+    else:
+        os.environ.pop(PROFILE_DIR_ENV, None)
+        set_profiler_hook(None)
+
+def _write_log(record):
+    if not _log_path:
+        return
+    line = json.dumps(record, default=str) + "\n"
+    with _log_lock:
+        try:
+            with open(_log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            pass
+
+def record(name, seconds, **fields):
+    """Account for a duration measured outside a ``span``, e.g. process start-up before imports finished."""
+    totals.add(name, seconds)
+    current = getattr(_local, "operation", None)
+    if current is not None:
+        current.add(name, seconds)
+    if _log_path:
+        _write_log(dict(fields, type="span", name=name, ms=round(seconds * 1000, 3), ts=time.time(),
+                        pid=os.getpid(), thread=threading.get_ident()))
+
+@contextmanager
+def span(name, **fields):
+    """Time a block, adding it to the global totals and to the enclosing ``operation``, if any."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, **fields)
+
+@contextmanager
+def operation(name, **fields):
+    """Group the spans run on this thread under ``name``; yields the operation's ``Timings``."""
+    timings = Timings()
+    outer = getattr(_local, "operation", None)
+    _local.operation = timings
+    profiler = _profiler_hook(name, fields) if _profiler_hook else None
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            with profiler:
+                yield timings
+        else:
+            yield timings
+    finally:
+        elapsed = time.perf_counter() - start
+        _local.operation = outer
+        timings.elapsed = elapsed
+        if outer is not None:
+            outer.add(name, elapsed)
+        totals.add(name, elapsed)
+        if _log_path:
+            _write_log(dict(fields, type="operation", name=name, ms=round(elapsed * 1000, 3), ts=time.time(),
+                            pid=os.getpid(), breakdown=timings.totals()))
+
+if os.environ.get(PROFILE_DIR_ENV):
+    set_profile_dir(os.environ[PROFILE_DIR_ENV])
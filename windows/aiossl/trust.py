@@ -0,0 +1,232 @@
+import base64
+import hashlib
+import json
+import os
+import platform
+import threading
+from cryptography import x509
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from .certs import (CERT_EXTENSIONS, load_certificates_from_pem, iter_certificates_from_file, verify_signature, subject_key_identifier,
+                    authority_key_identifier, fingerprint)
+from .paths import cache_path
+from .timing import span
+
+def _wincertstore():
+    if platform.system() != 'Windows':
+        return None
+    try:
+        import wincertstore
+    except ImportError:
+        return None
+    return wincertstore
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_NAME = "trust-snapshot.json"
+
+class TrustIndex:
+    """Issuer lookup table keyed by subject DER and Subject Key Identifier.
+
+    Entries restored from a snapshot keep only their DER and precomputed keys;
+    the certificate itself is parsed the first time a lookup needs it.
+    """
+    def __init__(self, certs=()):
+        self._by_subject = {}
+        self._by_ski = {}
+        self._entries = {}
+        self._parsed = {}
+        self.source_digest = None
+        for cert in certs:
+            self.add(cert)
+    def __len__(self):
+        return len(self._entries)
+    def __iter__(self):
+        return (self._cert(fp) for fp in list(self._entries))
+    def __contains__(self, cert):
+        return fingerprint(cert) in self._entries
+    def _add_entry(self, der, subject, ski, fp):
+        if fp in self._entries:
+            return False
+        self._entries[fp] = (der, subject, ski)
+        self._by_subject.setdefault(subject, []).append(fp)
+        if ski:
+            self._by_ski.setdefault(ski, []).append(fp)
+        return True
+    def _remove_entry(self, fp):
+        der, subject, ski = self._entries.pop(fp)
+        self._parsed.pop(fp, None)
+        for table, key in ((self._by_subject, subject), (self._by_ski, ski)):
+            fps = table.get(key)
+            if fps and fp in fps:
+                fps.remove(fp)
+                if not fps:
+                    del table[key]
+    def _cert(self, fp):
+        cert = self._parsed.get(fp)
+        if cert is None:
+            cert = x509.load_der_x509_certificate(self._entries[fp][0], default_backend())
+            self._parsed[fp] = cert
+        return cert
+    def add(self, cert):
+        fp = fingerprint(cert)
+        if fp in self._entries:
+            return False
+        self._parsed[fp] = cert
+        return self._add_entry(cert.public_bytes(serialization.Encoding.DER), cert.subject.public_bytes(),
+                               subject_key_identifier(cert), fp)
+    def add_der(self, der):
+        return self.add(x509.load_der_x509_certificate(der, default_backend()))
+    def add_pem_bundle(self, data):
+        return sum(self.add(c) for c in load_certificates_from_pem(data))
+    def add_file(self, path):
+        return sum(self.add(c) for c in iter_certificates_from_file(path))
+    def add_directory(self, path):
+        """Add every certificate file (PEM or DER) in the tree under ``path``."""
+        return sum(self.add_file(p) for p in iter_certificate_files(path))
+    def add_windows_stores(self, store_names=("ROOT", "CA")):
+        added = 0
+        for der in windows_store_ders(store_names):
+            try:
+                added += self.add_der(der)
+            except ValueError:
+                continue
+        return added
+    @classmethod
+    def from_pem_bundle(cls, data):
+        index = cls()
+        index.add_pem_bundle(data)
+        return index
+    @classmethod
+    def from_directory(cls, path):
+        index = cls()
+        index.add_directory(path)
+        return index
+    def candidates(self, cert):
+        """Possible issuers of ``cert``, AKI matches first, without verifying signatures."""
+        with span("lookup.trust_index"):
+            return self._candidates(cert)
+    def _candidates(self, cert):
+        issuer = cert.issuer.public_bytes()
+        aki = authority_key_identifier(cert)
+        fps = list(self._by_ski.get(aki, ())) if aki else []
+        fps += [fp for fp in self._by_subject.get(issuer, ()) if fp not in fps]
+        found = []
+        for fp in fps:
+            if self._entries[fp][1] == issuer:
+                try:
+                    found.append(self._cert(fp))
+                except ValueError:
+                    continue
+        return found
+    def find_issuer(self, cert):
+        for candidate in self.candidates(cert):
+            if verify_signature(cert, candidate):
+                return candidate
+        return None
+    def save_snapshot(self, path, source_digest):
+        enc = lambda b: base64.b64encode(b).decode("ascii") if b is not None else None
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "source_digest": source_digest,
+            "entries": [[enc(der), enc(subject), enc(ski), fp.hex()] for fp, (der, subject, ski) in self._entries.items()],
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    @classmethod
+    def load_snapshot(cls, path, source_digest):
+        """Restore an index from ``path`` if it was saved for ``source_digest``, else None."""
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+            if payload.get("version") != SNAPSHOT_VERSION or payload.get("source_digest") != source_digest:
+                return None
+            index = cls()
+            dec = lambda s: base64.b64decode(s) if s is not None else None
+            for der, subject, ski, fp in payload["entries"]:
+                index._add_entry(dec(der), dec(subject), dec(ski), bytes.fromhex(fp))
+            return index
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+def iter_certificate_files(path):
+    """Files with a ``CERT_EXTENSIONS`` suffix in the tree under ``path``, in a stable order."""
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(CERT_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+def windows_store_ders(store_names=("ROOT", "CA")):
+    ders = []
+    wincertstore = _wincertstore()
+    if not wincertstore:
+        return ders
+    for store_name in store_names:
+        try:
+            with wincertstore.CertSystemStore(store_name) as store:
+                for wc in store.itercerts():
+                    try:
+                        ders.append(wc.get_encoded())
+                    except Exception:
+                        continue
+        except Exception:
+            pass
+    return ders
+
+def store_digest(ders):
+    h = hashlib.sha256()
+    for der in sorted(ders):
+        h.update(len(der).to_bytes(4, "big"))
+        h.update(der)
+    return h.hexdigest()
+
+def load_system_trust_index(snapshot_path=None):
+    """Build the Windows ROOT/CA index, reusing the on-disk snapshot while the stores are unchanged."""
+    with span("store.enumerate"):
+        ders = windows_store_ders()
+        digest = store_digest(ders)
+    try:
+        snapshot_path = snapshot_path or cache_path(SNAPSHOT_NAME)
+    except OSError:
+        snapshot_path = None
+    with span("store.snapshot_load"):
+        index = TrustIndex.load_snapshot(snapshot_path, digest) if snapshot_path else None
+    if index is None:
+        index = TrustIndex()
+        with span("store.parse", certificates=len(ders)):
+            for der in ders:
+                try:
+                    index.add_der(der)
+                except ValueError:
+                    continue
+        if snapshot_path:
+            try:
+                with span("store.snapshot_save"):
+                    index.save_snapshot(snapshot_path, digest)
+            except OSError:
+                pass
+    index.source_digest = digest
+    return index
+
+def load_trust_index(trust_sources=(), use_system_store=True):
+    """The system index (or an empty one) extended with the certificate files and directories in ``trust_sources``."""
+    index = load_system_trust_index() if use_system_store else TrustIndex()
+    for source in trust_sources:
+        if os.path.isdir(source):
+            index.add_directory(source)
+        elif os.path.exists(source):
+            index.add_file(source)
+    return index
+
+_system_index = None
+_system_lock = threading.Lock()
+
+def get_system_trust_index():
+    """Process-wide index of the Windows ROOT and CA stores, built on first use."""
+    global _system_index
+    with _system_lock:
+        if _system_index is None:
+            _system_index = load_system_trust_index()
+        return _system_index
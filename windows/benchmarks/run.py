@@ -0,0 +1,187 @@
+"""Benchmark suite: ``python -m benchmarks [--depth N] [--store-size N] [--key-type rsa|ec|ed25519|all] [-o report.json]``
+
+Run from the ``windows`` directory. The JSON report uses sorted keys and a schema version so
+reports from different commits can be diffed or compared mechanically.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import cryptography
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.serialization import pkcs12
+from aiossl import certs as certcore
+from aiossl.chain import build_chain
+from aiossl.csr import build_csr
+from aiossl.keys import KEY_TYPES as CSR_KEY_TYPES, generate_private_key
+from aiossl.pfx import serialize_pfx
+from aiossl.trust import TrustIndex
+from .synthetic import SyntheticPKI, KEY_TYPES, issue, _name
+
+SCHEMA_VERSION = 1
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+def measure(fn, repeat, warmup=1, items=1):
+    """Time ``fn`` ``repeat`` times; ``items`` is how many units of work one call performs."""
+    for _ in range(warmup):
+        fn()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    total = sum(durations)
+    return {
+        "calls": repeat,
+        "items_per_call": items,
+        "mean_ms": round(statistics.fmean(durations) * 1000, 4),
+        "min_ms": round(durations[0] * 1000, 4),
+        "p50_ms": round(percentile(durations, 50) * 1000, 4),
+        "p90_ms": round(percentile(durations, 90) * 1000, 4),
+        "p99_ms": round(percentile(durations, 99) * 1000, 4),
+        "max_ms": round(durations[-1] * 1000, 4),
+        "items_per_sec": round(repeat * items / total, 2) if total else None,
+    }
+
+def bench_key_type(config, key_type, repeat):
+    pki = SyntheticPKI(depth=config.depth, store_size=config.store_size, key_type=key_type,
+                       cross_signs=config.cross_signs, leaves=config.leaves)
+    store = pki.store
+    bundle = b"".join(c.public_bytes(serialization.Encoding.PEM) for c in store)
+    der_bundle = b"".join(c.public_bytes(serialization.Encoding.DER) for c in store)
+    index = TrustIndex(store)
+    leaf = pki.leaves[0]
+    issuer = pki.chain_for(leaf)[1]
+    chain = pki.chain_for(leaf)
+    pfx_password = b"benchmark"
+    pfx = serialize_pfx(pki.leaf_key, chain, pfx_password)
+    results = {}
+    results["parse_pem_bundle"] = measure(lambda: certcore.load_certificates(bundle), repeat, items=len(store))
+    results["parse_der_bundle"] = measure(lambda: certcore.load_certificates(der_bundle), repeat, items=len(store))
+    results["trust_index_build"] = measure(lambda: TrustIndex.from_pem_bundle(bundle), repeat, items=len(store))
+    results["issuer_lookup"] = measure(lambda: [index.candidates(c) for c in pki.leaves], repeat, items=len(pki.leaves))
+    results["verify_uncached"] = measure(lambda: certcore._verify_uncached(leaf, issuer), repeat * 10)
+    results["verify_cached"] = measure(lambda: certcore.verify_signature(leaf, issuer), repeat * 10)
+    def chains():
+        certcore.verify_cache.clear()
+        return [build_chain([l], [index], anchors=index) for l in pki.leaves]
+    results["chain_build_cold"] = measure(chains, repeat, items=len(pki.leaves))
+    results["chain_build_warm"] = measure(lambda: [build_chain([l], [index], anchors=index) for l in pki.leaves],
+                                          repeat, items=len(pki.leaves))
+    results["pfx_serialize"] = measure(lambda: serialize_pfx(pki.leaf_key, chain, pfx_password), repeat)
+    results["pfx_extract"] = measure(lambda: pkcs12.load_key_and_certificates(pfx, pfx_password), repeat)
+    built = chains()
+    checks = {
+        "chains_complete": sum(r.complete for r in built),
+        "chains_trusted": sum(r.trusted for r in built),
+        "chain_depth": built[0].depth,
+        "chains": len(built),
+    }
+    return {"results": results, "checks": checks}
+
+def bench_key_algorithms(repeat, keygen_repeat):
+    """Key generation, CSR signing and certificate verification cost for every CSR key type."""
+    report = {}
+    subject = {"Common Name": "bench.test", "Organization": "AIO SSL Bench"}
+    for key_type in CSR_KEY_TYPES:
+        key = generate_private_key(key_type)
+        csr = build_csr(key, subject, ["bench.test"])
+        cert = issue(_name("Bench Key Type"), key)
+        results = {
+            "keygen": measure(lambda: generate_private_key(key_type), keygen_repeat, warmup=0),
+            "csr_sign": measure(lambda: build_csr(key, subject, ["bench.test"]), repeat),
+            "verify": measure(lambda: certcore._verify_uncached(cert, cert), repeat * 10),
+        }
+        checks = {
+            "verifies": certcore._verify_uncached(cert, cert),
+            "csr_signature_valid": csr.is_signature_valid,
+            "signature_bytes": len(cert.signature),
+            "public_key_bytes": len(key.public_key().public_bytes(serialization.Encoding.DER,
+                                                                  serialization.PublicFormat.SubjectPublicKeyInfo)),
+        }
+        report[key_type] = {"results": results, "checks": checks}
+    return report
+
+HEADLESS_IMPORTS = "import aiossl.cli, aiossl.chain, aiossl.trust, aiossl.certs"
+HEAVY_MODULES = ("tkinter", "customtkinter", "requests", "wincertstore",
+                 "cryptography.hazmat.primitives.serialization.pkcs12",
+                 "cryptography.hazmat.primitives.serialization.pkcs7")
+
+def bench_startup(repeat):
+    """Cold-start cost in fresh interpreters, plus which heavy modules a headless import pulls in."""
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def python(*args):
+        return subprocess.run([sys.executable, *args], cwd=here, check=True, capture_output=True, text=True).stdout
+    results = {
+        "interpreter": measure(lambda: python("-c", "pass"), repeat),
+        "import_core": measure(lambda: python("-c", HEADLESS_IMPORTS), repeat),
+        "cli_help": measure(lambda: python("-m", "aiossl", "--help"), repeat),
+    }
+    loaded = json.loads(python("-c", f"import json, sys; {HEADLESS_IMPORTS}; "
+                                     f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"))
+    return {"results": results, "checks": {"headless_heavy_modules": loaded}}
+
+def run(config):
+    key_types = KEY_TYPES if config.key_type == "all" else (config.key_type,)
+    report = {
+        "schema": SCHEMA_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "cryptography": cryptography.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {"depth": config.depth, "store_size": config.store_size, "cross_signs": config.cross_signs,
+                   "leaves": config.leaves, "repeat": config.repeat, "startup_repeat": config.startup_repeat,
+                   "keygen_repeat": config.keygen_repeat,
+                   "key_types": list(key_types)},
+        "key_types": {},
+    }
+    if config.keygen_repeat:
+        report["key_algorithms"] = bench_key_algorithms(config.repeat, config.keygen_repeat)
+    if config.startup_repeat:
+        report["startup"] = bench_startup(config.startup_repeat)
+    for key_type in key_types:
+        report["key_types"][key_type] = bench_key_type(config, key_type, config.repeat)
+    return report
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="AIO SSL Tool benchmark suite")
+    parser.add_argument("--depth", type=int, default=3, help="Chain length including leaf and root (default 3)")
+    parser.add_argument("--store-size", type=int, default=400, help="Certificates in the synthetic trust store")
+    parser.add_argument("--key-type", choices=KEY_TYPES + ("all",), default="all")
+    parser.add_argument("--cross-signs", type=int, default=1, help="Extra roots cross-signing the real root")
+    parser.add_argument("--leaves", type=int, default=8, help="Leaf certificates per chain-building run")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per benchmark")
+    parser.add_argument("--keygen-repeat", type=int, default=5,
+                        help="Key generations per CSR key type in the key algorithm benchmark (0 = skip)")
+    parser.add_argument("--startup-repeat", type=int, default=5, help="Fresh interpreters per start-up benchmark (0 = skip)")
+    parser.add_argument("-o", "--output", help="Write the JSON report here instead of stdout")
+    return parser
+
+def main(argv=None):
+    config = build_parser().parse_args(argv)
+    report = json.dumps(run(config), indent=2, sort_keys=True)
+    if config.output:
+        with open(config.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import datetime
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import rsa, ec, ed25519
+from cryptography.x509.oid import NameOID
+from aiossl.keys import signature_hash
+
+KEY_TYPES = ("rsa", "ec", "ed25519")
+
+def generate_key(key_type, rsa_bits=2048):
+    if key_type == "rsa":
+        return rsa.generate_private_key(65537, rsa_bits)
+    if key_type == "ec":
+        return ec.generate_private_key(ec.SECP256R1())
+    if key_type == "ed25519":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unknown key type: {key_type}")
+
+def _name(cn):
+    return x509.Name([x509.NameAttribute(NameOID.ORGANIZATION_NAME, "AIO SSL Bench"),
+                      x509.NameAttribute(NameOID.COMMON_NAME, cn)])
+
+def issue(subject, key, issuer=None, issuer_key=None, ca=True, serial=1, now=None, days=365, sans=()):
+    """Certificate for ``subject``/``key``; self-signed when no issuer is given."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    issuer_name = issuer.subject if issuer is not None else subject
+    signer = issuer_key or key
+    builder = (x509.CertificateBuilder()
+               .subject_name(subject)
+               .issuer_name(issuer_name)
+               .public_key(key.public_key())
+               .serial_number(serial)
+               .not_valid_before(now - datetime.timedelta(days=1))
+               .not_valid_after(now + datetime.timedelta(days=days))
+               .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+               .add_extension(x509.SubjectKeyIdentifier.from_public_key(key.public_key()), critical=False)
+               .add_extension(x509.AuthorityKeyIdentifier.from_issuer_public_key(signer.public_key()), critical=False))
+    if sans:
+        builder = builder.add_extension(x509.SubjectAlternativeName([x509.DNSName(s) for s in sans]), critical=False)
+    return builder.sign(signer, signature_hash(signer))
+
+
+class SyntheticPKI:
+    """A locally generated hierarchy: root -> ``depth - 2`` intermediates -> ``leaves`` leaf certificates.
+
+    ``store_size`` unrelated self-signed CAs pad the trust store (they share one key, so
+    building a large store stays cheap), and ``cross_signs`` extra roots each cross-sign
+    the real root, giving the path builder alternative routes to choose between.
+    """
+    def __init__(self, depth=3, store_size=400, key_type="rsa", cross_signs=0, leaves=8, rsa_bits=2048):
+        if depth < 2:
+            raise ValueError("depth must be at least 2 (leaf and root)")
+        self.key_type = key_type
+        self.depth = depth
+        serial = iter(range(1, 1 << 30))
+        now = datetime.datetime.now(datetime.timezone.utc)
+        new_key = lambda: generate_key(key_type, rsa_bits)
+        self.root_key = new_key()
+        self.root = issue(_name("Bench Root"), self.root_key, serial=next(serial), now=now)
+        self.intermediates = []
+        parent, parent_key = self.root, self.root_key
+        for level in range(depth - 2):
+            key = new_key()
+            cert = issue(_name(f"Bench Intermediate {level + 1}"), key, parent, parent_key, serial=next(serial), now=now)
+            self.intermediates.insert(0, cert)
+            parent, parent_key = cert, key
+        self.leaf_key = new_key()
+        self.leaves = [issue(_name(f"host{i}.bench.test"), self.leaf_key, parent, parent_key, ca=False,
+                             serial=next(serial), now=now, sans=[f"host{i}.bench.test"])
+                       for i in range(leaves)]
+        self.cross_roots = []
+        self.cross_certs = []
+        for i in range(cross_signs):
+            key = new_key()
+            other = issue(_name(f"Bench Cross Root {i + 1}"), key, serial=next(serial), now=now)
+            self.cross_roots.append(other)
+            self.cross_certs.append(issue(self.root.subject, self.root_key, other, key, serial=next(serial), now=now))
+        filler_key = new_key()
+        self.filler = [issue(_name(f"Bench Filler CA {i}"), filler_key, serial=next(serial), now=now)
+                       for i in range(max(0, store_size - 1 - len(self.intermediates) - 2 * cross_signs))]
+    @property
+    def store(self):
+        """Everything a populated trust store would hold: root, intermediates, cross roots and filler."""
+        return [self.root] + self.intermediates + self.cross_roots + self.cross_certs + self.filler
+    def chain_for(self, leaf):
+        return [leaf] + self.intermediates + [self.root]
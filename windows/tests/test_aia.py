@@ -0,0 +1,84 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from aiossl.aia import AIAFetcher, MAX_RESPONSE_BYTES
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get("If-None-Match")))
+        body, etag = server.routes[self.path]
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("Cache-Control", f"max-age={server.max_age}")
+            self.end_headers()
+            return
+        self.send_response(200)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", f"max-age={server.max_age}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.routes = {}
+    httpd.requests = []
+    httpd.max_age = 0
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_first_fetch_then_etag_revalidation(server, tmp_path):
+    server.routes["/ca.cer"] = (b"issuer-der", '"v1"')
+    url = server.url + "/ca.cer"
+    assert AIAFetcher(cache_dir=str(tmp_path)).fetch(url) == b"issuer-der"
+    assert server.requests == [("/ca.cer", None)]
+    # A new fetcher has no memory cache; max-age=0 forces a conditional request answered with 304.
+    assert AIAFetcher(cache_dir=str(tmp_path)).fetch(url) == b"issuer-der"
+    assert server.requests[1] == ("/ca.cer", '"v1"')
+
+def test_stale_cache_is_used_when_the_network_fails(server, tmp_path):
+    server.routes["/ca.cer"] = (b"issuer-der", None)
+    url = server.url + "/ca.cer"
+    assert AIAFetcher(cache_dir=str(tmp_path)).fetch(url) == b"issuer-der"
+    server.shutdown()
+    server.server_close()
+    assert AIAFetcher(cache_dir=str(tmp_path), timeout=2).fetch(url) == b"issuer-der"
+
+def test_oversized_response_is_rejected(server, tmp_path):
+    server.routes["/big.cer"] = (b"x" * (MAX_RESPONSE_BYTES * 2), None)
+    assert AIAFetcher(cache_dir=str(tmp_path)).fetch(server.url + "/big.cer") is None
+
+def test_oversized_update_keeps_the_cached_body(server, tmp_path):
+    server.routes["/ca.cer"] = (b"issuer-der", None)
+    url = server.url + "/ca.cer"
+    assert AIAFetcher(cache_dir=str(tmp_path)).fetch(url) == b"issuer-der"
+    server.routes["/ca.cer"] = (b"x" * (MAX_RESPONSE_BYTES * 2), None)
+    assert AIAFetcher(cache_dir=str(tmp_path)).fetch(url) == b"issuer-der"
+
+def test_same_fetcher_revalidates_after_max_age(server, tmp_path):
+    server.routes["/ca.cer"] = (b"issuer-v1", '"v1"')
+    url = server.url + "/ca.cer"
+    fetcher = AIAFetcher(cache_dir=str(tmp_path))
+    assert fetcher.fetch(url) == b"issuer-v1"
+    server.routes["/ca.cer"] = (b"issuer-v2", '"v2"')
+    assert fetcher.fetch(url) == b"issuer-v2"
+    assert server.requests[1] == ("/ca.cer", '"v1"')
+
+def test_memory_cache_is_fresh_until_max_age_and_bounded(server, tmp_path):
+    server.max_age = 3600
+    fetcher = AIAFetcher(cache_dir=str(tmp_path), max_memory=2)
+    for name in ("a", "b", "c"):
+        server.routes[f"/{name}.cer"] = (name.encode(), None)
+        assert fetcher.fetch(f"{server.url}/{name}.cer") == name.encode()
+    assert fetcher.fetch(f"{server.url}/c.cer") == b"c"
+    assert len(server.requests) == 3
+    assert list(fetcher._memory) == [f"{server.url}/b.cer", f"{server.url}/c.cer"]
@@ -0,0 +1,69 @@
+import csv
+import json
+import os
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.serialization import pkcs12
+from benchmarks.synthetic import SyntheticPKI
+from aiossl.batch import PFX_EXTENSIONS, iter_input_paths, read_csr_manifest, read_password_list, run_csr_batch, run_pfx_batch
+from aiossl.pfx import serialize_pfx
+
+def test_invalid_manifest_rows_are_reported_and_the_rest_generated(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([
+        {"common_name": "good.example.test", "key_type": "ECDSA P-256"},
+        {"common_name": "bad.example.test", "key_type": "rsa1234"},
+        "not an object",
+        {"common_name": "also-good.example.test", "key_type": "ed25519", "sans": "a.test b.test"},
+    ]))
+    entries = read_csr_manifest(str(manifest))
+    assert [("error" in e) for e in entries] == [False, True, True, False]
+    out = tmp_path / "out"
+    results = {r["name"]: r for r in run_csr_batch(entries, str(out), workers=1)}
+    assert results["good.example.test"]["status"] == "ok"
+    assert results["also-good.example.test"]["status"] == "ok"
+    assert results["bad.example.test"]["status"] == "error"
+    assert "Unsupported key type" in results["bad.example.test"]["error"]
+    assert results["row-3"]["status"] == "error"
+    with open(out / "csr_report.csv", newline="") as f:
+        report = {row["name"]: row for row in csv.DictReader(f)}
+    assert set(report) == set(results)
+    assert report["bad.example.test"]["status"] == "error"
+    assert (out / "good.example.test.csr.pem").exists()
+
+def test_read_password_list_keeps_order_blanks_and_drops_duplicates(tmp_path):
+    path = tmp_path / "passwords.txt"
+    path.write_text("first\r\n\nsecond\nfirst\n", encoding="utf-8")
+    assert read_password_list(str(path)) == ["first", "", "second"]
+
+def test_pfx_batch(tmp_path):
+    pki = SyntheticPKI(depth=3, store_size=0, key_type="ec", leaves=1)
+    chain = pki.chain_for(pki.leaves[0])
+    inputs = tmp_path / "in"
+    for sub in ("a", "b"):
+        (inputs / sub).mkdir(parents=True)
+    (inputs / "a" / "site.pfx").write_bytes(serialize_pfx(pki.leaf_key, chain, b"pw-second"))
+    (inputs / "b" / "site.pfx").write_bytes(serialize_pfx(pki.leaf_key, chain, b"pw-first"))
+    (inputs / "plain.p12").write_bytes(pkcs12.serialize_key_and_certificates(
+        b"plain", pki.leaf_key, pki.leaves[0], None, serialization.NoEncryption()))
+    (inputs / "locked.pfx").write_bytes(serialize_pfx(pki.leaf_key, chain, b"pw-unknown"))
+    (inputs / "notes.txt").write_text("ignored")
+    out = tmp_path / "out"
+    paths = list(iter_input_paths([str(inputs)], extensions=PFX_EXTENSIONS))
+    results = {os.path.relpath(r["path"], inputs): r
+               for r in run_pfx_batch(paths, ["pw-first", "pw-second"], str(out), workers=1, use_learned=False)}
+    assert sorted(results) == [os.path.join("a", "site.pfx"), os.path.join("b", "site.pfx"), "locked.pfx", "plain.p12"]
+    first, second = results[os.path.join("a", "site.pfx")], results[os.path.join("b", "site.pfx")]
+    assert (first["status"], first["password_index"], first["name"]) == ("ok", 2, "site")
+    assert (second["status"], second["password_index"], second["name"]) == ("ok", 1, "site-2")
+    assert results["plain.p12"]["password_index"] == 0 and "chain" not in results["plain.p12"]
+    assert results["locked.pfx"]["status"] == "error"
+    assert results["locked.pfx"]["error"] == "None of the 3 candidate passwords opened the file"
+    assert first["chain_certs"] == 2
+    for name in ("site", "site-2"):
+        assert os.path.exists(out / f"{name}.key.pem") and os.path.exists(out / f"{name}.crt.pem")
+    assert open(out / "site.chain.pem", "rb").read().count(b"BEGIN CERTIFICATE") == 2
+    report = (out / "pfx_report.csv").read_text(encoding="utf-8")
+    assert "pw-" not in report
+    rows = {row["name"]: row for row in csv.DictReader(report.splitlines())}
+    assert (rows["site"]["password_index"], rows["site-2"]["password_index"], rows["plain"]["password_index"]) == ("2", "1", "0")
+    assert rows["locked"]["status"] == "error" and rows["locked"]["password_index"] == ""
@@ -0,0 +1,85 @@
+import datetime
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from benchmarks.synthetic import SyntheticPKI, _name, generate_key, issue
+from aiossl.certs import VerifyCache, _rsa_padding, _verify_uncached, iter_certificates
+
+@pytest.fixture(scope="module")
+def pki():
+    return SyntheticPKI(depth=3, store_size=0, key_type="ec", leaves=2)
+
+def test_pem_bad_block_offsets(pki):
+    good = [c.public_bytes(serialization.Encoding.PEM) for c in pki.leaves]
+    bad = b"-----BEGIN CERTIFICATE-----\nbm90IGEgY2VydA==\n-----END CERTIFICATE-----"
+    errors = []
+    certs = list(iter_certificates(good[0] + bad + b"\n" + good[1], errors))
+    assert certs == pki.leaves
+    assert [(e.offset, e.length) for e in errors] == [(len(good[0]), len(bad))]
+
+def test_der_bad_block_offsets(pki):
+    good = [c.public_bytes(serialization.Encoding.DER) for c in pki.leaves]
+    bad = b"\x30\x03abc"
+    errors = []
+    certs = list(iter_certificates(good[0] + bad + good[1] + b"\x01\x02", errors))
+    assert certs == pki.leaves
+    assert [(e.offset, e.length) for e in errors] == [(len(good[0]), len(bad)),
+                                                      (len(good[0]) + len(bad) + len(good[1]), 2)]
+
+def test_unterminated_pem_block(pki):
+    good = pki.leaves[0].public_bytes(serialization.Encoding.PEM)
+    errors = []
+    assert list(iter_certificates(good + b"-----BEGIN CERTIFICATE-----\nAAAA", errors)) == [pki.leaves[0]]
+    assert errors[0].offset == len(good)
+    assert errors[0].reason.startswith("Unterminated")
+
+@pytest.mark.parametrize("key_type", ["ec", "ed25519"])
+def test_verify_uncached(key_type):
+    pki = SyntheticPKI(depth=3, store_size=0, key_type=key_type, leaves=1)
+    leaf, issuer = pki.leaves[0], pki.intermediates[0]
+    assert _verify_uncached(leaf, issuer)
+    assert _verify_uncached(issuer, pki.root)
+    assert not _verify_uncached(leaf, pki.root)
+
+class _WithoutPaddingParameters:
+    """A certificate as older cryptography releases expose it, without ``signature_algorithm_parameters``."""
+    def __init__(self, cert):
+        self._cert = cert
+    def __getattr__(self, name):
+        if name == "signature_algorithm_parameters":
+            raise AttributeError(name)
+        return getattr(self._cert, name)
+
+def test_verify_rsa_pss():
+    now = datetime.datetime.now(datetime.timezone.utc)
+    root_key, leaf_key = generate_key("rsa"), generate_key("rsa")
+    root = issue(_name("PSS Root"), root_key)
+    leaf = (x509.CertificateBuilder().subject_name(_name("pss.test")).issuer_name(root.subject)
+            .public_key(leaf_key.public_key()).serial_number(2)
+            .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=30))
+            .sign(root_key, hashes.SHA256(),
+                  rsa_padding=padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH)))
+    assert _verify_uncached(leaf, root)
+    assert isinstance(_rsa_padding(_WithoutPaddingParameters(leaf)), padding.PSS)
+    assert _verify_uncached(_WithoutPaddingParameters(leaf), root)
+    assert not _verify_uncached(leaf, issue(_name("Other Root"), generate_key("rsa")))
+
+def test_verify_cache_counts_hits_and_evicts_least_recently_used(pki):
+    cache = VerifyCache(maxsize=2)
+    leaf, issuer, root = pki.leaves[0], pki.intermediates[0], pki.root
+    assert cache.verify(leaf, issuer) and cache.verify(issuer, root)
+    assert not cache.verify(leaf, root)
+    assert cache.stats() == {"hits": 0, "misses": 3, "size": 2, "maxsize": 2}
+    # (leaf, issuer) was evicted first; a cached False is a hit like any other result.
+    assert not cache.verify(leaf, root)
+    assert cache.verify(issuer, root)
+    assert cache.stats()["hits"] == 2
+    assert cache.verify(leaf, issuer)
+    assert cache.stats()["misses"] == 4
+    # Re-adding (leaf, issuer) evicted (leaf, root), the least recently used entry by then.
+    cache.verify(issuer, root)
+    cache.verify(leaf, root)
+    assert cache.stats() == {"hits": 3, "misses": 5, "size": 2, "maxsize": 2}
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
@@ -0,0 +1,53 @@
+import datetime
+from benchmarks.synthetic import SyntheticPKI, _name, generate_key, issue
+from aiossl.chain import build_chain
+from aiossl.trust import TrustIndex
+
+def test_trusted_root_beats_a_cross_signed_path_to_an_untrusted_root():
+    pki = SyntheticPKI(depth=3, store_size=0, key_type="ec", cross_signs=1, leaves=1)
+    leaf = pki.leaves[0]
+    result = build_chain([leaf], [TrustIndex(pki.store)], anchors=TrustIndex([pki.root]))
+    assert result.chain == pki.chain_for(leaf)
+    assert result.complete and result.trusted
+    assert any(r.chain[-1] == pki.cross_roots[0] and r.reason == "ends at an untrusted root" for r in result.rejected)
+
+def test_cross_signed_path_wins_when_only_its_root_is_trusted():
+    pki = SyntheticPKI(depth=3, store_size=0, key_type="ec", cross_signs=1, leaves=1)
+    leaf = pki.leaves[0]
+    result = build_chain([leaf], [TrustIndex(pki.store)], anchors=TrustIndex(pki.cross_roots))
+    assert result.chain == [leaf] + pki.intermediates + [pki.cross_certs[0], pki.cross_roots[0]]
+    assert result.trusted
+
+def test_expired_intermediate_loses_to_a_valid_reissue():
+    now = datetime.datetime.now(datetime.timezone.utc)
+    root_key, ca_key = generate_key("ec"), generate_key("ec")
+    root = issue(_name("Test Root"), root_key)
+    expired = issue(_name("Test CA"), ca_key, root, root_key, serial=2, now=now - datetime.timedelta(days=30), days=10)
+    current = issue(_name("Test CA"), ca_key, root, root_key, serial=3)
+    leaf = issue(_name("leaf.test"), generate_key("ec"), current, ca_key, ca=False, serial=4)
+    result = build_chain([leaf], [TrustIndex([expired, current, root])], anchors=TrustIndex([root]))
+    assert result.chain == [leaf, current, root]
+    assert [r.chain[1] for r in result.rejected] == [expired]
+    assert result.rejected[0].reason.startswith("outside validity period")
+
+def test_incomplete_chain_without_issuer():
+    pki = SyntheticPKI(depth=3, store_size=0, key_type="ec", leaves=1)
+    result = build_chain([pki.leaves[0]], [TrustIndex([pki.root])])
+    assert result.chain == [pki.leaves[0]]
+    assert result.status == "incomplete"
+
+def test_trusted_path_is_found_behind_many_untrusted_alternatives():
+    pki = SyntheticPKI(depth=3, store_size=0, key_type="ec", cross_signs=20, leaves=1)
+    leaf = pki.leaves[0]
+    result = build_chain([leaf], [TrustIndex(pki.store)], anchors=TrustIndex([pki.cross_roots[19]]))
+    assert result.trusted
+    assert result.chain == [leaf] + pki.intermediates + [pki.cross_certs[19], pki.cross_roots[19]]
+    assert len(result.rejected) == 20
+
+def test_expansion_budget_still_returns_a_result():
+    pki = SyntheticPKI(depth=4, store_size=0, key_type="ec", leaves=1)
+    leaf = pki.leaves[0]
+    assert build_chain([leaf], [TrustIndex(pki.store)], max_expansions=0).chain == [leaf]
+    result = build_chain([leaf], [TrustIndex(pki.store)], max_expansions=1)
+    assert result.chain == [leaf] and result.status == "incomplete"
+    assert build_chain([leaf], [TrustIndex(pki.store)], anchors=TrustIndex([pki.root]), max_expansions=3).trusted
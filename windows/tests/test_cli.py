@@ -0,0 +1,12 @@
+import pytest
+from aiossl.cli import build_parser
+
+@pytest.mark.parametrize("command", [["chain", "-o", "out"], ["serve"], ["inventory", "scan", "certs"]])
+def test_trust_options_are_shared(command, tmp_path):
+    args = build_parser().parse_args(command + ["--trust", str(tmp_path), "--no-system-store", "--no-aia", "--no-learned"])
+    assert args.trust == [str(tmp_path)]
+    assert args.no_system_store and args.no_aia and args.no_learned
+
+def test_missing_trust_source_is_rejected(tmp_path):
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["chain", "-o", "out", "--trust", str(tmp_path / "missing.pem")])
@@ -0,0 +1,81 @@
+import datetime
+import os
+import shutil
+import pytest
+from cryptography.hazmat.primitives import serialization
+from benchmarks.synthetic import _name, generate_key, issue
+from aiossl.inventory import Inventory
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+def _write(path, *certs):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        for cert in certs:
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+
+@pytest.fixture
+def tree(tmp_path):
+    root_key, ca_key, stray_key = generate_key("ec"), generate_key("ec"), generate_key("ec")
+    root = issue(_name("Inventory Root"), root_key)
+    ca = issue(_name("Inventory CA"), ca_key, root, root_key, serial=2)
+    stray = issue(_name("Stray CA"), stray_key, serial=3)
+    leaf = lambda cn, issuer, key, **kw: issue(_name(cn), generate_key("ec"), issuer, key, ca=False, sans=[cn], **kw)
+    _write(str(tmp_path / "trust" / "root.pem"), root, ca)
+    certs = tmp_path / "certs"
+    _write(str(certs / "long" / "long.pem"), leaf("long.test", ca, ca_key, serial=10))
+    _write(str(certs / "short" / "short.pem"), leaf("short.test", ca, ca_key, serial=11, days=10))
+    _write(str(certs / "expired.pem"), leaf("expired.test", ca, ca_key, serial=12, now=NOW - datetime.timedelta(days=30), days=10))
+    _write(str(certs / "orphan.pem"), leaf("orphan.test", stray, stray_key, serial=13))
+    return {"certs": str(certs), "trust": str(tmp_path / "trust"), "db": str(tmp_path / "inventory.sqlite"),
+            "sibling": str(tmp_path / "certs-other")}
+
+def _scan(inventory, tree, roots=None, **kwargs):
+    counts = {}
+    results = list(inventory.scan(roots or [tree["certs"]], workers=1, trust_sources=[tree["trust"]],
+                                  use_system_store=False, use_aia=False, use_learned=False, counts=counts, **kwargs))
+    return counts, results
+
+def _subjects(rows):
+    return sorted(row["sans"] for row in rows)
+
+def test_scan_rescan_and_query(tree):
+    with Inventory(tree["db"]) as inventory:
+        counts, _ = _scan(inventory, tree)
+        assert counts["added"] == 4 and counts["error"] == 0
+        assert _subjects(inventory.query()) == ["expired.test", "long.test", "orphan.test", "short.test"]
+        assert _subjects(inventory.query(expiring_days=30)) == ["short.test"]
+        assert _subjects(inventory.query(expired=True)) == ["expired.test"]
+        assert _subjects(inventory.query(issuer="stray")) == ["orphan.test"]
+        assert _subjects(inventory.query(incomplete=True)) == ["orphan.test"]
+        assert _subjects(inventory.query(untrusted=True)) == ["orphan.test"]
+        assert inventory.query(limit=1)[0]["sans"] == "expired.test"
+        summary = inventory.summary()
+        assert (summary["certificates"], summary["expired"], summary["expiring"], summary["incomplete"]) == (4, 1, 1, 1)
+
+        counts, results = _scan(inventory, tree)
+        assert counts["unchanged"] == 4 and results == []
+        short = os.path.join(tree["certs"], "short", "short.pem")
+        os.utime(short, ns=(0, 0))
+        counts, results = _scan(inventory, tree)
+        assert [r["status"] for r in results] == ["unchanged"]
+        with open(os.path.join(tree["certs"], "long", "long.pem"), "ab") as f:
+            f.write(b"\n")
+        counts, results = _scan(inventory, tree)
+        assert counts["updated"] == 1 and counts["unchanged"] == 3
+
+def test_prune_removed_subdirectory_and_root(tree):
+    os.makedirs(tree["sibling"])
+    shutil.copy(os.path.join(tree["certs"], "orphan.pem"), tree["sibling"])
+    with Inventory(tree["db"]) as inventory:
+        _scan(inventory, tree, roots=[tree["certs"], tree["sibling"]])
+        shutil.rmtree(os.path.join(tree["certs"], "short"))
+        counts, _ = _scan(inventory, tree)
+        assert counts["removed"] == 1
+        assert "short.test" not in _subjects(inventory.query())
+        shutil.rmtree(tree["certs"])
+        counts, results = _scan(inventory, tree)
+        assert counts["removed"] == 3
+        # Only the deleted root's files go; the sibling directory sharing its name prefix stays.
+        assert _subjects(inventory.query()) == ["orphan.test"]
+        assert inventory.query()[0]["path"].startswith(tree["sibling"])
@@ -0,0 +1,63 @@
+import itertools
+import threading
+import time
+from aiossl.keys import KeyPool
+
+class _FakeGenerator:
+    """Stands in for generate_private_key so the pool's bookkeeping can be checked quickly."""
+    def __init__(self):
+        self.made = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+    def __call__(self, key_type):
+        with self._lock:
+            key = (key_type, next(self._ids))
+            self.made.append(key)
+            return key
+
+def _wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_pool_is_bounded_and_refills_after_take():
+    generate = _FakeGenerator()
+    pool = KeyPool(max_size=2, generate=generate)
+    pool.prefill("ECDSA P-256")
+    _wait_for(lambda: pool.available("p256") == 2)
+    time.sleep(0.05)
+    assert len(generate.made) == 2
+    key = pool.take("p256")
+    assert key in generate.made
+    _wait_for(lambda: pool.available("p256") == 2)
+    assert len(generate.made) == 3
+    pool.close()
+
+def test_changing_the_type_drops_old_keys_and_take_falls_back_to_generating():
+    generate = _FakeGenerator()
+    pool = KeyPool(max_size=2, generate=generate)
+    pool.prefill("p256")
+    _wait_for(lambda: pool.available("p256") == 2)
+    pooled = [k for k in generate.made if k[0] == "p256"]
+    pool.prefill("ed25519")
+    assert pool.available("p256") == 0
+    _wait_for(lambda: pool.available("ed25519") == 2)
+    key = pool.take("rsa2048")
+    assert key[0] == "rsa2048" and key not in pooled
+    assert pool.take("ed25519")[0] == "ed25519"
+    pool.close()
+
+def test_close_discards_unused_keys_and_stops_generating():
+    generate = _FakeGenerator()
+    pool = KeyPool(max_size=3, generate=generate)
+    pool.prefill("p384")
+    _wait_for(lambda: pool.available("p384") == 3)
+    pool.close()
+    assert pool.available("p384") == 0
+    pool._thread.join(5)
+    assert not pool._thread.is_alive()
+    made = len(generate.made)
+    pool.prefill("p384")
+    assert pool.take("p384") == ("p384", made)
+    assert len(generate.made) == made + 1 and pool.available("p384") == 0
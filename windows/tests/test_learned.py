@@ -0,0 +1,50 @@
+import multiprocessing
+import os
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from benchmarks.synthetic import SyntheticPKI
+from aiossl.learned import IntermediatePool
+
+def test_learn_only_writes_on_flush(tmp_path):
+    path = str(tmp_path / "learned.json")
+    pki = SyntheticPKI(depth=4, store_size=0, key_type="ec", leaves=1)
+    pool = IntermediatePool(path)
+    for cert in pki.chain_for(pki.leaves[0]):
+        pool.learn([cert])
+    assert len(pool) == 2
+    assert not os.path.exists(path)
+    assert pool.flush()
+    assert not pool.flush()
+    assert len(IntermediatePool(path)) == 2
+
+def test_flush_merges_entries_saved_by_another_process(tmp_path):
+    path = str(tmp_path / "learned.json")
+    first = SyntheticPKI(depth=3, store_size=0, key_type="ec", leaves=1)
+    second = SyntheticPKI(depth=3, store_size=0, key_type="ec", leaves=1)
+    ours, theirs = IntermediatePool(path), IntermediatePool(path)
+    ours.learn(first.intermediates)
+    theirs.learn(second.intermediates)
+    assert theirs.flush()
+    assert ours.flush()
+    assert len(IntermediatePool(path)) == 2
+
+def _learn_and_flush(path, ders, barrier):
+    pool = IntermediatePool(path)
+    pool.learn([x509.load_der_x509_certificate(der) for der in ders])
+    barrier.wait()
+    pool.flush()
+
+def test_concurrent_flushes_keep_every_process_entries(tmp_path):
+    path = str(tmp_path / "learned.json")
+    workers = 8
+    pkis = [SyntheticPKI(depth=4, store_size=0, key_type="ec", leaves=1) for _ in range(workers)]
+    barrier = multiprocessing.Barrier(workers)
+    processes = [multiprocessing.Process(target=_learn_and_flush, args=(
+                     path, [c.public_bytes(serialization.Encoding.DER) for c in pki.intermediates], barrier))
+                 for pki in pkis]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join(30)
+        assert p.exitcode == 0
+    assert len(IntermediatePool(path)) == 2 * workers
@@ -0,0 +1,80 @@
+import http.client
+import json
+import socket
+import threading
+import pytest
+from cryptography.hazmat.primitives import serialization
+from benchmarks.synthetic import SyntheticPKI
+from aiossl.service import ChainService, ServiceServer
+
+@pytest.fixture
+def server():
+    service = ChainService(use_system_store=False, use_aia=False, use_learned=False, key_pool_size=0)
+    httpd = ServiceServer(("127.0.0.1", 0), service, token="secret")
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def _request(server, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        conn.request(method, path, body=body, headers=dict({"Authorization": "Bearer secret"}, **(headers or {})))
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+def test_token_is_required(server):
+    assert _request(server, "GET", "/health")[0] == 200
+    assert _request(server, "GET", "/health", headers={"Authorization": "Bearer wrong"})[0] == 401
+    assert _request(server, "GET", "/health", headers={"Authorization": "Bearer sécret"})[0] == 401
+
+def test_bad_content_length_is_rejected(server):
+    for length in ("-1", "abc"):
+        conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+        conn.putrequest("POST", "/csr")
+        conn.putheader("Authorization", "Bearer secret")
+        conn.putheader("Content-Length", length)
+        conn.endheaders()
+        assert conn.getresponse().status == 400
+        conn.close()
+
+def test_pack_pfx_validates_field_types(server):
+    pki = SyntheticPKI(depth=2, store_size=0, key_type="ec", leaves=1)
+    key = pki.leaf_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                     serialization.NoEncryption()).decode()
+    cert = pki.leaves[0].public_bytes(serialization.Encoding.PEM).decode()
+    good = {"key": key, "certificates": cert, "password": "pw", "complete_chain": False}
+    status, body = _request(server, "POST", "/pfx", json.dumps(good))
+    assert status == 200 and body
+    for field, value in (("key", 1), ("certificates", ["x"]), ("password", None), ("key_password", 5)):
+        status, body = _request(server, "POST", "/pfx", json.dumps(dict(good, **{field: value})))
+        assert status == 400
+        assert field in json.loads(body)["error"]
+    assert _request(server, "POST", "/pfx", json.dumps(["not", "an", "object"]))[0] == 400
+
+def test_unauthorized_post_body_is_not_parsed_as_a_request(server):
+    smuggled = b"GET /health HTTP/1.1\r\nHost: x\r\nAuthorization: Bearer secret\r\n\r\n"
+    head = (f"POST /csr HTTP/1.1\r\nHost: x\r\nAuthorization: Bearer wrong\r\n"
+            f"Content-Length: {len(smuggled)}\r\n\r\n").encode()
+    with socket.create_connection(server.server_address, timeout=5) as sock:
+        sock.sendall(head + smuggled)
+        received = b""
+        try:
+            while chunk := sock.recv(65536):
+                received += chunk
+        except socket.timeout:
+            pass
+    assert received.startswith(b"HTTP/1.1 401")
+    assert received.count(b"HTTP/1.1") == 1
+
+def test_generate_csr_validates_field_types(server):
+    status, body = _request(server, "POST", "/csr", json.dumps({"common_name": "csr.test", "key_type": "p256",
+                                                                 "sans": ["a.test"]}))
+    assert status == 200 and "BEGIN CERTIFICATE REQUEST" in json.loads(body)["csr_pem"]
+    for request in (["x"], {"common_name": 5}, {"sans": [1]}, {"sans": {"a": 1}}, {"key_type": ["p256"]}):
+        status, body = _request(server, "POST", "/csr", json.dumps(request))
+        assert status == 400, request
+        assert "error" in json.loads(body)
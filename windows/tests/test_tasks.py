@@ -0,0 +1,30 @@
+import threading
+from aiossl.tasks import TaskRunner
+
+def test_cancelling_a_queued_task_delivers_on_cancel_and_clears_it():
+    runner = TaskRunner(lambda: None, max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    events = []
+    def blocking(task):
+        started.set()
+        release.wait(5)
+        task.check_cancelled()
+    runner.submit("one", blocking, on_cancel=lambda t: events.append("cancel1"))
+    assert started.wait(5)
+    runner.submit("two", lambda task: events.append("ran"), on_cancel=lambda t: events.append("cancel2"))
+    runner.cancel_all()
+    release.set()
+    runner._executor.shutdown(wait=True)
+    runner.dispatch()
+    assert sorted(events) == ["cancel1", "cancel2"]
+    assert runner.active == []
+    assert not runner.running("two")
+
+def test_completed_task_reports_result_once():
+    runner = TaskRunner(lambda: None, max_workers=2)
+    results = []
+    runner.submit("job", lambda task, x: x * 2, 21, on_done=results.append)
+    runner._executor.shutdown(wait=True)
+    runner.dispatch()
+    assert results == [42]
+    assert runner.active == []
@@ -0,0 +1,62 @@
+import json
+import os
+import pstats
+from contextlib import contextmanager
+import pytest
+from aiossl.timing import cprofile_hook, operation, set_perf_log, set_profiler_hook, span
+
+@pytest.fixture
+def perf_log(tmp_path):
+    path = str(tmp_path / "perf.jsonl")
+    set_perf_log(path)
+    yield path
+    set_perf_log(None)
+
+@pytest.fixture
+def profiler_hook():
+    yield set_profiler_hook
+    set_profiler_hook(None)
+
+def test_spans_count_in_the_innermost_operation():
+    with operation("outer") as outer:
+        with span("outer.step"):
+            pass
+        with operation("inner") as inner:
+            with span("inner.step"):
+                pass
+            with span("inner.step"):
+                pass
+    assert set(inner.totals()) == {"inner.step"}
+    assert inner.totals()["inner.step"]["count"] == 2
+    assert set(outer.totals()) == {"outer.step", "inner"}
+    assert outer.elapsed >= inner.elapsed > 0
+
+def test_perf_log_writes_json_lines(perf_log):
+    with operation("test.op", path="x.pem"):
+        with span("test.span", size=3):
+            pass
+    with open(perf_log, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [(r["type"], r["name"]) for r in records] == [("span", "test.span"), ("operation", "test.op")]
+    span_record, op_record = records
+    assert span_record["size"] == 3 and span_record["pid"] == os.getpid() and span_record["ms"] >= 0
+    assert op_record["path"] == "x.pem"
+    assert op_record["breakdown"]["test.span"]["count"] == 1
+
+def test_profiler_hook_wraps_every_operation(profiler_hook, tmp_path):
+    calls = []
+    @contextmanager
+    def hook(name, fields):
+        calls.append(("enter", name, fields))
+        yield
+        calls.append(("exit", name))
+    profiler_hook(hook)
+    with operation("hooked", path="a"):
+        calls.append(("body",))
+    assert calls == [("enter", "hooked", {"path": "a"}), ("body",), ("exit", "hooked")]
+    profiler_hook(cprofile_hook(str(tmp_path / "prof")))
+    with operation("profiled"):
+        sum(range(1000))
+    (name,) = os.listdir(tmp_path / "prof")
+    assert name.startswith("profiled-")
+    assert pstats.Stats(str(tmp_path / "prof" / name)).total_calls > 0
@@ -0,0 +1,34 @@
+from cryptography.hazmat.primitives import serialization
+from benchmarks.synthetic import SyntheticPKI, _name, generate_key, issue
+from aiossl.trust import TrustIndex
+
+def test_lookup_prefers_the_ski_match_among_same_named_issuers():
+    name = _name("Shared Name CA")
+    old_key, new_key = generate_key("ec"), generate_key("ec")
+    old, new = issue(name, old_key), issue(name, new_key)
+    leaf = issue(_name("leaf.test"), generate_key("ec"), new, new_key, ca=False)
+    index = TrustIndex([old, new])
+    assert index.candidates(leaf) == [new, old]
+    assert index.find_issuer(leaf) == new
+
+def test_snapshot_round_trip_and_digest_mismatch(tmp_path):
+    pki = SyntheticPKI(depth=3, store_size=20, key_type="ec", leaves=1)
+    path = str(tmp_path / "snapshot.json")
+    TrustIndex(pki.store).save_snapshot(path, "digest-1")
+    restored = TrustIndex.load_snapshot(path, "digest-1")
+    assert len(restored) == len(pki.store)
+    assert restored.find_issuer(pki.leaves[0]) == pki.intermediates[0]
+    assert pki.root in restored
+    assert TrustIndex.load_snapshot(path, "digest-2") is None
+    assert TrustIndex.load_snapshot(str(tmp_path / "missing.json"), "digest-1") is None
+
+def test_add_directory_recurses_and_reads_der(tmp_path):
+    pki = SyntheticPKI(depth=4, store_size=0, key_type="ec", leaves=1)
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (tmp_path / "root.pem").write_bytes(pki.root.public_bytes(serialization.Encoding.PEM))
+    (nested / "intermediate.der").write_bytes(pki.intermediates[0].public_bytes(serialization.Encoding.DER))
+    (nested / "ignored.txt").write_bytes(pki.intermediates[1].public_bytes(serialization.Encoding.PEM))
+    index = TrustIndex.from_directory(str(tmp_path))
+    assert len(index) == 2
+    assert pki.intermediates[0] in index